@@ -1,36 +1,9 @@
-import time
-from modules.game import Game
-from modules.ai import RandomAI, MonteCarloAI
-from othello_rust import Color
+import sys
+from modules.cli import main
 
 # --- メイン処理 ---
+# 以前の固定設定 (RandomAI vs MonteCarloAI, 10戦) は `python main.py match` で実行できる。
+# 詳しくは `python main.py --help` を参照。
 
 if __name__ == "__main__":
-    # Rust実装なので10,000回でも高速に終わります
-    num_games = 10
-    results = {"BLACK": 0, "WHITE": 0, "DRAW": 0}
-
-    start_time = time.time()
-
-    for i in range(num_games):
-        game_manager = Game(RandomAI, MonteCarloAI)
-        winner = game_manager.play()
-
-        if winner == Color.BLACK:
-            results["BLACK"] += 1
-        elif winner == Color.WHITE:
-            results["WHITE"] += 1
-        else:
-            results["DRAW"] += 1
-        
-    elapsed = time.time() - start_time
-
-    print("-" * 40)
-    print(f"対戦結果 (10,000戦):")
-    print(f"  黒 (RandomAI): {results['BLACK']} 勝")
-    print(f"  白 (MonteCarloAI): {results['WHITE']} 勝")
-    print(f"  引き分け     : {results['DRAW']}")
-    print("-" * 40)
-    print(f"勝率 (MonteCarloAI): {(results['WHITE'] / num_games) * 100:.2f}%")
-    print(f"総計算時間: {elapsed:.4f}s")
-    print(f"1試合平均 : {elapsed / num_games:.6f}s")
\ No newline at end of file
+    sys.exit(main())
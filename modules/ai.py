@@ -1,5 +1,7 @@
-from othello_rust import Color, BitboardOthello
-from typing import Optional, List, Tuple
+from modules.backend import Color, BitboardOthello, PlayoutPolicy
+from modules.weights import load_eval_weights, load_playout_weights
+import os
+from typing import Dict, Optional, List, Sequence, Tuple, Union
 import random
 from abc import ABC, abstractmethod
 
@@ -58,29 +60,73 @@ class YosumiAI(AI):
         # 3. 仕方なければ全候補から選ぶ
         return random.choice(positions)
 
+def yosumi_playout_weights() -> List[int]:
+    """YosumiAI と同じ考え方のプレイアウト用の重み (四隅を高く、危険地帯を低く)"""
+    weights = []
+    for i in range(64):
+        pos = (i % 8, i // 8)
+        if pos in YosumiAI.CORNERS:
+            weights.append(32)
+        elif pos in YosumiAI.DANGER_ZONES:
+            weights.append(1)
+        else:
+            weights.append(8)
+    return weights
+
+
 class MonteCarloAI(AI):
     SIMULATIONS_PER_MOVE = 200
+    # プレイアウトの方式
+    #   "python" : Python で 1 手ずつ一様ランダムに打つ (従来の方式)
+    #   "uniform": 拡張モジュール側で一様ランダムに打つ
+    #   "heavy"  : 拡張モジュール側でマスの重みに比例した確率で打つ
+    PLAYOUT = "python"
+    PLAYOUT_MODES = ("python", "uniform", "heavy")
+    # heavy 用の重みファイル (modules/weights.py の "playout")。None なら yosumi_playout_weights()
+    WEIGHTS: Optional[str] = None
+
+    def __init__(self, color: Color, game: BitboardOthello, playout: Optional[str] = None,
+                 weights: Union[str, Sequence[int], None] = None) -> None:
+        super().__init__(color, game)
+        self.playout = playout or self.PLAYOUT
+        if self.playout not in self.PLAYOUT_MODES:
+            raise ValueError(f"unknown playout mode: {self.playout}")
+
+        self.policy = None
+        if self.playout == "heavy":
+            weights = weights if weights is not None else self.WEIGHTS
+            if weights is None:
+                weights = yosumi_playout_weights()
+            elif isinstance(weights, str):
+                weights = load_playout_weights(weights)
+            self.policy = PlayoutPolicy(list(weights))
 
     def place(self) -> Optional[Tuple[int, int]]:
-        positions = self.legal_moves()
-        if not positions:
+        win_rates = self.evaluate_moves()
+        if not win_rates:
             return None
-
-        best_move = None
-        best_win_rate = -1.0
-
-        for move in positions:
-            wins = 0
-            for _ in range(self.SIMULATIONS_PER_MOVE):
-                if self.simulate_game(move):
-                    wins += 1
-            win_rate = wins / self.SIMULATIONS_PER_MOVE
-
-            if win_rate > best_win_rate:
-                best_win_rate = win_rate
-                best_move = move
-
-        return best_move
+        # 勝率が同じなら先に見つかった手を選ぶ
+        return max(win_rates, key=win_rates.get)
+
+    def evaluate_moves(self) -> Dict[Tuple[int, int], float]:
+        """合法手ごとのプレイアウト勝率を返す"""
+        win_rates = {}
+        for move in self.legal_moves():
+            if self.playout == "python":
+                wins = 0
+                for _ in range(self.SIMULATIONS_PER_MOVE):
+                    if self.simulate_game(move):
+                        wins += 1
+            else:
+                temp_board = self.game.copy()
+                temp_board.make_move(move[0], move[1], self.color)
+                # シードは random から取るので、play_seeded などで再現できる
+                wins, _ = temp_board.playout_wins(
+                    self.color, self.color.other, self.SIMULATIONS_PER_MOVE,
+                    self.policy, random.getrandbits(64),
+                )
+            win_rates[move] = wins / self.SIMULATIONS_PER_MOVE
+        return win_rates
 
     def simulate_game(self, first_move: Tuple[int, int]) -> bool:
         temp_board = self.game.copy()
@@ -115,4 +161,51 @@ class MonteCarloAI(AI):
         elif white_count > black_count:
             return Color.WHITE
         else:
-            return None  # Draw
\ No newline at end of file
+            return None  # Draw
+
+
+class UniformMonteCarloAI(MonteCarloAI):
+    PLAYOUT = "uniform"
+
+
+class HeavyMonteCarloAI(MonteCarloAI):
+    PLAYOUT = "heavy"
+
+
+class AlphaBetaAI(AI):
+    """評価関数 (マスの重み + 着手可能数の差) による alpha-beta 探索
+
+    探索は拡張モジュール側の BitboardOthello.search で行い、その間 GIL は解放される。
+    THREADS > 1 なら Lazy SMP で並列に探索する (純 Python 実装では 1 スレッド)。
+    """
+    DEPTH = 6
+    THREADS = 1
+    HASH_MB = 16
+    # 評価関数の重みファイル (modules/weights.py の "eval", "mobility", "pattern")。None なら既定の表
+    # modules/tune.py で自己対局の局面から作れる
+    WEIGHTS: Optional[str] = None
+
+    def __init__(self, color: Color, game: BitboardOthello, depth: Optional[int] = None,
+                 threads: Optional[int] = None, weights: Optional[str] = None) -> None:
+        super().__init__(color, game)
+        self.depth = depth or self.DEPTH
+        self.threads = threads or self.THREADS
+        self.squares = None
+        self.mobility = None
+        self.pattern = None
+        weights = weights if weights is not None else self.WEIGHTS
+        if weights is not None:
+            self.squares, self.mobility, self.pattern = load_eval_weights(weights)
+
+    def search(self):
+        kwargs = {"weights": self.squares, "pattern": self.pattern}
+        if self.mobility is not None:
+            kwargs["mobility"] = self.mobility
+        return self.game.search(self.color, self.depth, self.threads, self.HASH_MB, **kwargs)
+
+    def place(self) -> Optional[Tuple[int, int]]:
+        return self.search().best_move
+
+
+class SMPAlphaBetaAI(AlphaBetaAI):
+    THREADS = os.cpu_count() or 1
@@ -0,0 +1,361 @@
+import sys
+import threading
+import time
+from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
+                             QHBoxLayout, QComboBox, QPushButton, QLabel, 
+                             QGridLayout, QFrame, QMessageBox, QScrollArea,
+                             QSpinBox, QDoubleSpinBox, QTableWidget, QTableWidgetItem)
+from PySide6.QtCore import Qt, Signal, QObject, QTimer
+from PySide6.QtGui import QPainter, QColor, QFont
+
+# 既存モジュールのインポート
+from modules import registry
+from modules.game import Game
+from modules.backend import Color, BitboardOthello, BoardSnapshot
+
+# スレッド間でUI更新を安全に行うためのシグナル用クラス
+class GameSignals(QObject):
+    update_board = Signal(object)
+    update_status = Signal(str)
+    update_score = Signal(int, int)
+    game_over = Signal(object)
+
+class OthelloBoard(QFrame):
+    """盤面描画専用のウィジェット"""
+    def __init__(self, parent=None, size=400):
+        super().__init__(parent)
+        self.size_px = size
+        self.setFixedSize(size, size)
+        self.othello = None
+
+    def update_data(self, snapshot):
+        # snapshot は不変 (BoardSnapshot) なので、描画中に書き換わることはない
+        self.othello = snapshot
+        self.update() # 再描画をトリガー
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        # 背景（緑）
+        painter.setBrush(QColor("#2e7d32"))
+        painter.drawRect(0, 0, self.size_px, self.size_px)
+
+        # 罫線
+        painter.setPen(QColor("#1b5e20"))
+        cell_size = self.size_px // 8
+        for i in range(9):
+            painter.drawLine(i * cell_size, 0, i * cell_size, self.size_px)
+            painter.drawLine(0, i * cell_size, self.size_px, i * cell_size)
+
+        if not self.othello:
+            return
+
+        # 石の描画
+        black_bits = self.othello.black
+        white_bits = self.othello.white
+        padding = max(1, cell_size * 3 // 25)
+
+        for i in range(64):
+            x = i % 8
+            y = i // 8
+            mask = 1 << i
+            
+            rect = (x * cell_size + padding, y * cell_size + padding, 
+                    cell_size - padding*2, cell_size - padding*2)
+
+            if black_bits & mask:
+                painter.setBrush(Qt.black)
+                painter.setPen(Qt.NoPen)
+                painter.drawEllipse(*rect)
+            elif white_bits & mask:
+                painter.setBrush(Qt.white)
+                painter.setPen(Qt.NoPen)
+                painter.drawEllipse(*rect)
+
+class MainWindow(QMainWindow):
+    def __init__(self):
+        super().__init__()
+        self.setup_ui()
+        self.setWindowTitle("Rust Othello AI Battle")
+        self.setFixedSize(450, 650)
+        self.is_running = False
+
+        self.signals = GameSignals()
+        self.signals.update_board.connect(self.board_widget.update_data)
+        self.signals.update_status.connect(self.status_label.setText)
+        self.signals.update_score.connect(self.update_score_label)
+        self.signals.game_over.connect(self.show_end_game)
+
+    def setup_ui(self):
+        central_widget = QWidget()
+        self.setCentralWidget(central_widget)
+        layout = QVBoxLayout(central_widget)
+
+        # --- 設定エリア ---
+        config_group = QFrame()
+        config_group.setFrameStyle(QFrame.StyledPanel)
+        config_layout = QGridLayout(config_group)
+
+        config_layout.addWidget(QLabel("黒 (先手):"), 0, 0)
+        self.black_combo = QComboBox()
+        for name in registry.available():
+            self.black_combo.addItem(registry.label(name), name)
+        config_layout.addWidget(self.black_combo, 0, 1)
+
+        config_layout.addWidget(QLabel("白 (後手):"), 1, 0)
+        self.white_combo = QComboBox()
+        for name in registry.available():
+            self.white_combo.addItem(registry.label(name), name)
+        self.white_combo.setCurrentText("Monte Carlo AI")
+        config_layout.addWidget(self.white_combo, 1, 1)
+
+        self.start_btn = QPushButton("対局開始")
+        self.start_btn.setFixedHeight(40)
+        self.start_btn.clicked.connect(self.on_start_click)
+        config_layout.addWidget(self.start_btn, 2, 0, 1, 2)
+
+        layout.addWidget(config_group)
+
+        # --- 盤面エリア ---
+        self.board_widget = OthelloBoard()
+        layout.addWidget(self.board_widget, alignment=Qt.AlignCenter)
+
+        # --- ステータスエリア ---
+        self.status_label = QLabel("AIを選択してください")
+        self.status_label.setAlignment(Qt.AlignCenter)
+        layout.addWidget(self.status_label)
+
+        self.score_label = QLabel("黒: 2 | 白: 2")
+        self.score_label.setAlignment(Qt.AlignCenter)
+        self.score_label.setStyleSheet("font-size: 18px; font-weight: bold;")
+        layout.addWidget(self.score_label)
+
+    def update_score_label(self, b, w):
+        self.score_label.setText(f"黒: {b} | 白: {w}")
+
+    def on_start_click(self):
+        if self.is_running: return
+        self.is_running = True
+        self.start_btn.setEnabled(False)
+        
+        thread = threading.Thread(target=self.run_game_loop)
+        thread.daemon = True
+        thread.start()
+
+    def run_game_loop(self):
+        BlackAI = registry.resolve(self.black_combo.currentData())
+        WhiteAI = registry.resolve(self.white_combo.currentData())
+        
+        game_manager = Game(BlackAI, WhiteAI)
+        othello = game_manager.othello
+        turn_color = Color.BLACK
+        pass_count = 0
+
+        # UI スレッドには不変のスナップショットだけを渡す (対局中の盤面は渡さない)
+        self.signals.update_board.emit(game_manager.feed.latest.board)
+
+        while pass_count < 2:
+            current_ai = game_manager.black_ai if turn_color == Color.BLACK else game_manager.white_ai
+            color_name = "黒" if turn_color == Color.BLACK else "白"
+            self.signals.update_status.emit(f"{color_name} の思考中...")
+            
+            move = current_ai.place()
+            if move:
+                x, y = move
+                othello.make_move(x, y, turn_color)
+                pass_count = 0
+            else:
+                pass_count += 1
+            
+            turn_color = Color.WHITE if turn_color == Color.BLACK else Color.BLACK
+            state = game_manager.feed.publish(othello, turn_color, move)
+            self.signals.update_board.emit(state.board)
+            b, w = state.count_stones()
+            self.signals.update_score.emit(b, w)
+            
+            time.sleep(0.1)
+
+        winner = game_manager.winner()
+        self.signals.game_over.emit(winner)
+
+    def show_end_game(self, winner):
+        self.is_running = False
+        self.start_btn.setEnabled(True)
+        
+        if winner == Color.BLACK: msg = "黒 (BLACK) の勝利！"
+        elif winner == Color.WHITE: msg = "白 (WHITE) の勝利！"
+        else: msg = "引き分けです"
+            
+        self.status_label.setText("対局終了")
+        QMessageBox.information(self, "対局結果", msg)
+
+class SpectatorWindow(QMainWindow):
+    """複数の対局を並べて観戦する画面
+
+    対局は modules.spectate.Spectator がプロセスプールで並行に進める。
+    盤面の更新は 1 フレーム (約 16ms) ごとにまとめて取り出し、変わった盤面だけ再描画する。
+    """
+    FRAME_MS = 16
+    BOARD_SIZE = 160
+    COLUMNS = 6
+
+    def __init__(self, boards=24):
+        super().__init__()
+        self.spectator = None
+        self.score = None
+        self.boards = []
+        self.captions = []
+        self.setup_ui(boards)
+        self.setWindowTitle("Rust Othello AI Battle - 観戦")
+        self.resize(1280, 860)
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(self.FRAME_MS)
+        self.timer.timeout.connect(self.on_frame)
+
+    def setup_ui(self, boards):
+        central_widget = QWidget()
+        self.setCentralWidget(central_widget)
+        layout = QVBoxLayout(central_widget)
+
+        # --- 設定エリア ---
+        config_layout = QHBoxLayout()
+        self.a_combo = QComboBox()
+        self.b_combo = QComboBox()
+        for name in registry.available():
+            self.a_combo.addItem(registry.label(name), name)
+            self.b_combo.addItem(registry.label(name), name)
+        self.b_combo.setCurrentText("Monte Carlo AI")
+        config_layout.addWidget(QLabel("AI A:"))
+        config_layout.addWidget(self.a_combo)
+        config_layout.addWidget(QLabel("AI B:"))
+        config_layout.addWidget(self.b_combo)
+
+        config_layout.addWidget(QLabel("盤面数:"))
+        self.boards_spin = QSpinBox()
+        self.boards_spin.setRange(1, 120)
+        self.boards_spin.setValue(boards)
+        config_layout.addWidget(self.boards_spin)
+
+        config_layout.addWidget(QLabel("1手の間隔 (秒):"))
+        self.delay_spin = QDoubleSpinBox()
+        self.delay_spin.setRange(0.0, 2.0)
+        self.delay_spin.setSingleStep(0.05)
+        self.delay_spin.setValue(0.1)
+        config_layout.addWidget(self.delay_spin)
+
+        self.start_btn = QPushButton("観戦開始")
+        self.start_btn.clicked.connect(self.on_start_click)
+        config_layout.addWidget(self.start_btn)
+        layout.addLayout(config_layout)
+
+        body = QHBoxLayout()
+        # --- 盤面の一覧 ---
+        self.scroll = QScrollArea()
+        self.scroll.setWidgetResizable(True)
+        body.addWidget(self.scroll, stretch=1)
+
+        # --- 通算成績 ---
+        side = QVBoxLayout()
+        self.score_table = QTableWidget(2, 5)
+        self.score_table.setHorizontalHeaderLabels(["勝", "分", "負", "勝率", "黒番/白番の勝ち"])
+        self.score_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.score_table.setFixedWidth(380)
+        side.addWidget(self.score_table)
+        self.status_label = QLabel("AIを選択してください")
+        side.addWidget(self.status_label)
+        side.addStretch()
+        body.addLayout(side)
+        layout.addLayout(body)
+
+    def build_boards(self, count):
+        # 前回の盤面は setWidget で古いウィジェットごと破棄される
+        grid_widget = QWidget()
+        grid_layout = QGridLayout(grid_widget)
+        self.boards, self.captions = [], []
+        for i in range(count):
+            cell = QVBoxLayout()
+            caption = QLabel(f"#{i + 1}\n")
+            caption.setFixedWidth(self.BOARD_SIZE)
+            board = OthelloBoard(size=self.BOARD_SIZE)
+            cell.addWidget(caption)
+            cell.addWidget(board)
+            grid_layout.addLayout(cell, i // self.COLUMNS, i % self.COLUMNS)
+            self.boards.append(board)
+            self.captions.append(caption)
+        self.scroll.setWidget(grid_widget)
+
+    def on_start_click(self):
+        from modules.spectate import Score, Spectator
+
+        if self.spectator is not None:
+            self.stop()
+            return
+
+        ai_a, ai_b = self.a_combo.currentData(), self.b_combo.currentData()
+        self.build_boards(self.boards_spin.value())
+        self.score = Score()
+        self.score_table.setVerticalHeaderLabels([
+            f"A: {registry.label(ai_a)}", f"B: {registry.label(ai_b)}",
+        ])
+        self.update_score_table()
+        self.spectator = Spectator(ai_a, ai_b, self.boards_spin.value(), delay=self.delay_spin.value())
+        self.spectator.start()
+        self.timer.start()
+        self.start_btn.setText("停止")
+        self.boards_spin.setEnabled(False)
+
+    def stop(self):
+        self.timer.stop()
+        self.spectator.stop()
+        self.spectator = None
+        self.start_btn.setText("観戦開始")
+        self.boards_spin.setEnabled(True)
+
+    def on_frame(self):
+        updates, finished = self.spectator.poll()
+        for slot, update in updates.items():
+            self.boards[slot].update_data(BoardSnapshot(update.black, update.white))
+            job = update.job
+            b = bin(update.black).count("1")
+            w = bin(update.white).count("1")
+            mark = "  終局" if update.finished else ""
+            self.captions[slot].setText(
+                f"#{job.job_id + 1} {registry.label(job.black)} vs {registry.label(job.white)}\n"
+                f"黒: {b} | 白: {w}{mark}"
+            )
+
+        if finished:
+            for result in finished:
+                self.score.add(result)
+            self.update_score_table()
+        self.status_label.setText(f"{self.spectator.games} 局終了  ({self.spectator.games_per_sec():.2f} games/sec)")
+
+    def update_score_table(self):
+        s = self.score
+        rows = [
+            (s.wins, s.draws, s.losses, s.rate, f"{s.black_wins} / {s.white_wins}"),
+            (s.losses, s.draws, s.wins, 1.0 - s.rate if s.games else 0.0, "-"),
+        ]
+        for row, values in enumerate(rows):
+            for col, value in enumerate(values):
+                text = f"{value * 100:.1f}%" if col == 3 else str(value)
+                self.score_table.setItem(row, col, QTableWidgetItem(text))
+
+    def closeEvent(self, event):
+        if self.spectator is not None:
+            self.stop()
+        super().closeEvent(event)
+
+def main(spectate=0):
+    """spectate > 0 なら、その数の盤面を並べる観戦画面を開く"""
+    app = QApplication.instance() or QApplication(sys.argv)
+    # 日本語が化ける場合は明示的にフォントを指定可能
+    # app.setFont(QFont("Microsoft YaHei", 9)) 
+    window = SpectatorWindow(spectate) if spectate else MainWindow()
+    window.show()
+    return app.exec()
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,223 @@
+"""棋譜の一括解析パイプライン
+
+棋譜 (Game.moves または "f5d6c3..." 形式の文字列) を BitboardOthello で再生し、
+各局面をプロセスプールで評価して、手ごとに
+「エンジンの最善手・実際の手の評価値・最善手との差」を順番に出力する。
+
+- 同じ局面は 8 通りの対称変換で正規化したキーで重複排除する (LRU キャッシュ)
+- 先読みするのは window 局面まで、キャッシュも cache_size 件までなので、
+  棋譜の量に関係なくメモリ使用量は一定
+"""
+import random
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from modules import registry
+from modules.game import replay_moves
+from modules.notation import Move, parse_moves
+from modules.backend import Color, BitboardOthello
+
+# 正規化キー: (手番 0/1, 黒, 白)
+Key = Tuple[int, int, int]
+
+_COLORS = (Color.BLACK, Color.WHITE)
+
+
+@dataclass
+class Annotation:
+    game: int
+    ply: int
+    color: Color
+    move: Tuple[int, int]
+    best: Tuple[int, int]
+    value: float
+    best_value: float
+
+    @property
+    def loss(self) -> float:
+        return self.best_value - self.value
+
+
+# --- 盤面の対称変換 -------------------------------------------------------
+
+def _mirror(b: int) -> int:
+    """左右反転 (x -> 7 - x)"""
+    b = ((b >> 1) & 0x5555555555555555) | ((b & 0x5555555555555555) << 1)
+    b = ((b >> 2) & 0x3333333333333333) | ((b & 0x3333333333333333) << 2)
+    return ((b >> 4) & 0x0F0F0F0F0F0F0F0F) | ((b & 0x0F0F0F0F0F0F0F0F) << 4)
+
+
+def _flip(b: int) -> int:
+    """上下反転 (y -> 7 - y)"""
+    return int.from_bytes(b.to_bytes(8, "little"), "big")
+
+
+def _transpose(b: int) -> int:
+    """対角線での反転 (x <-> y)"""
+    t = 0x0F0F0F0F00000000 & (b ^ (b << 28))
+    b ^= t ^ (t >> 28)
+    t = 0x3333000033330000 & (b ^ (b << 14))
+    b ^= t ^ (t >> 14)
+    t = 0x5500550055005500 & (b ^ (b << 7))
+    return b ^ t ^ (t >> 7)
+
+
+def transform(b: int, t: int) -> int:
+    """t (0-7) 番目の対称変換をかける"""
+    if t & 1:
+        b = _mirror(b)
+    if t & 2:
+        b = _flip(b)
+    if t & 4:
+        b = _transpose(b)
+    return b
+
+
+# マス番号の変換表と、その逆変換表
+SQUARE_MAP: List[List[int]] = [
+    [transform(1 << sq, t).bit_length() - 1 for sq in range(64)] for t in range(8)
+]
+SQUARE_UNMAP: List[List[int]] = [[0] * 64 for _ in range(8)]
+for _t in range(8):
+    for _sq, _mapped in enumerate(SQUARE_MAP[_t]):
+        SQUARE_UNMAP[_t][_mapped] = _sq
+
+
+def canonical(black: int, white: int, color: Color) -> Tuple[Key, int]:
+    """8 通りの変換のうちキーが最小になるものを選び、(キー, 変換番号) を返す"""
+    best = None
+    best_t = 0
+    for t in range(8):
+        key = (transform(black, t), transform(white, t))
+        if best is None or key < best:
+            best, best_t = key, t
+    return (0 if color == Color.BLACK else 1, best[0], best[1]), best_t
+
+
+# --- ワーカー側 ------------------------------------------------------------
+
+_worker_ai = None
+_worker_simulations = 0
+
+
+def _init_worker(ai_name: str, simulations: int) -> None:
+    global _worker_ai, _worker_simulations
+    _worker_ai = registry.resolve(ai_name)
+    _worker_simulations = simulations
+
+
+def evaluate_position(key: Key) -> Dict[int, float]:
+    """正規化された局面の合法手ごとの評価値を {マス番号: 値} で返す"""
+    color_index, black, white = key
+    ai = _worker_ai(_COLORS[color_index], BitboardOthello.from_bits(black, white))
+    ai.SIMULATIONS_PER_MOVE = _worker_simulations
+    # 同じ局面なら何度評価しても同じ結果になるようにする
+    random.seed(hash(key))
+    return {y * 8 + x: value for (x, y), value in ai.evaluate_moves().items()}
+
+
+# --- パイプライン -----------------------------------------------------------
+
+def iter_games(path: str) -> Iterator[List[Move]]:
+    """1 行 1 局の棋譜ファイルを 1 局ずつ読む"""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield parse_moves(line)
+
+
+def iter_positions(games: Iterable[Sequence[Move]]) -> Iterator[Tuple[int, int, BitboardOthello, Color, Tuple[int, int]]]:
+    """各局の (局番号, 手数, 着手前の盤面, 手番, 着手) を順に返す (パスは除く)"""
+    for game_index, moves in enumerate(games):
+        for ply, (board, color, move) in enumerate(replay_moves(list(moves))):
+            if move is not None:
+                yield game_index, ply, board, color, move
+
+
+class _Pending:
+    __slots__ = ("game", "ply", "color", "move", "t", "future", "values")
+
+    def __init__(self, game, ply, color, move, t, future, values):
+        self.game, self.ply, self.color, self.move = game, ply, color, move
+        self.t, self.future, self.values = t, future, values
+
+
+def _annotate(p: _Pending, values: Dict[int, float]) -> Annotation:
+    x, y = p.move
+    square = SQUARE_MAP[p.t][y * 8 + x]
+    if square not in values:
+        raise ValueError(f"illegal move {p.move} in game {p.game} ply {p.ply}")
+    # 同じ値なら番号の小さいマスを最善とし、結果を決定的にする
+    best_square = max(sorted(values), key=values.get)
+    best = SQUARE_UNMAP[p.t][best_square]
+    return Annotation(
+        p.game, p.ply, p.color, p.move, (best % 8, best // 8), values[square], values[best_square]
+    )
+
+
+def analyze(
+    games: Iterable[Sequence[Move]],
+    ai: str = "montecarlo",
+    simulations: int = 50,
+    workers: Optional[int] = None,
+    window: int = 256,
+    cache_size: int = 100_000,
+) -> Iterator[Annotation]:
+    """棋譜を解析し、入力と同じ順番で Annotation を返すイテレーター
+
+    ai には evaluate_moves() を持つ AI のレジストリ名を指定する。持たない AI は
+    プールを起動する前にここで ValueError にする。
+    """
+    if not hasattr(registry.resolve(ai), "evaluate_moves"):
+        raise ValueError(f"AI {ai!r} cannot evaluate moves (no evaluate_moves())")
+    return _analyze(games, ai, simulations, workers, window, cache_size)
+
+
+def _analyze(
+    games: Iterable[Sequence[Move]],
+    ai: str,
+    simulations: int,
+    workers: Optional[int],
+    window: int,
+    cache_size: int,
+) -> Iterator[Annotation]:
+    cache: "OrderedDict[Key, Dict[int, float]]" = OrderedDict()
+    inflight: Dict[Key, Future] = {}
+    pending: Deque[_Pending] = deque()
+
+    def finish(p: _Pending) -> Annotation:
+        values = p.values
+        if values is None:
+            values = p.future.result()
+            key = p.future.key  # type: ignore[attr-defined]
+            if inflight.pop(key, None) is not None:
+                cache[key] = values
+                if len(cache) > cache_size:
+                    cache.popitem(last=False)
+        return _annotate(p, values)
+
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(ai, simulations)) as pool:
+        for game_index, ply, board, color, move in iter_positions(games):
+            key, t = canonical(board.black, board.white, color)
+            values = cache.get(key)
+            future = None
+            if values is not None:
+                cache.move_to_end(key)
+            else:
+                future = inflight.get(key)
+                if future is None:
+                    future = pool.submit(evaluate_position, key)
+                    future.key = key  # type: ignore[attr-defined]
+                    inflight[key] = future
+            pending.append(_Pending(game_index, ply, color, move, t, future, values))
+
+            # 先頭から評価済みのものを順に出す。窓が一杯なら先頭の完了を待つ
+            while pending and (
+                len(pending) >= window or pending[0].future is None or pending[0].future.done()
+            ):
+                yield finish(pending.popleft())
+
+        while pending:
+            yield finish(pending.popleft())
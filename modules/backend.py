@@ -0,0 +1,62 @@
+"""盤面実装 (Color / BitboardOthello など) の選択
+
+Rust 拡張 othello_rust が import できればそれを使い、無ければ純 Python 実装
+(modules/pybitboard.py) に切り替える。環境変数 OTHELLO_BACKEND に "rust" か
+"python" を指定すると強制できる。古いビルドの othello_rust が入っているときは
+RuntimeWarning を出して純 Python 実装に切り替える (OTHELLO_BACKEND=rust なら ImportError)。
+
+    from modules.backend import Color, BitboardOthello
+
+評価関数の既定値 (EVAL_SQUARE_WEIGHTS / EVAL_MOBILITY_WEIGHT / CORNER_REGIONS) も
+選んだ実装のものを使う。
+"""
+import os
+import warnings
+
+BACKEND = os.environ.get("OTHELLO_BACKEND", "").lower()
+
+if BACKEND == "python":
+    from modules.pybitboard import (
+        Color, BitboardOthello, BoardSnapshot, PlayoutPolicy, SearchResult,
+        EVAL_SQUARE_WEIGHTS, EVAL_MOBILITY_WEIGHT, CORNER_REGIONS,
+    )
+elif BACKEND == "rust":
+    from othello_rust import (
+        Color, BitboardOthello, BoardSnapshot, PlayoutPolicy, SearchResult,
+        EVAL_SQUARE_WEIGHTS, EVAL_MOBILITY_WEIGHT, CORNER_REGIONS,
+    )
+else:
+    try:
+        from othello_rust import (
+            Color, BitboardOthello, BoardSnapshot, PlayoutPolicy, SearchResult,
+            EVAL_SQUARE_WEIGHTS, EVAL_MOBILITY_WEIGHT, CORNER_REGIONS,
+        )
+        BACKEND = "rust"
+    except ModuleNotFoundError as e:
+        # othello_rust 自体が無いときだけ切り替える。拡張の中で別のモジュールが見つからない
+        # 場合まで純 Python 実装で黙って動くと、遅くなった原因が分からなくなる
+        if e.name != "othello_rust":
+            raise
+        from modules.pybitboard import (
+            Color, BitboardOthello, BoardSnapshot, PlayoutPolicy, SearchResult,
+            EVAL_SQUARE_WEIGHTS, EVAL_MOBILITY_WEIGHT, CORNER_REGIONS,
+        )
+        BACKEND = "python"
+    except ImportError as e:
+        # 入ってはいるがクラスや定数が足りない = 古いビルド。全部のコマンドが動かなくなるよりは
+        # 警告を出して純 Python 実装で動かす (OTHELLO_BACKEND=rust なら上でそのままエラーになる)
+        warnings.warn(
+            f"installed othello_rust is out of date ({e}); using the pure-Python backend. "
+            "Rebuild it with 'maturin develop --release'",
+            RuntimeWarning,
+        )
+        from modules.pybitboard import (
+            Color, BitboardOthello, BoardSnapshot, PlayoutPolicy, SearchResult,
+            EVAL_SQUARE_WEIGHTS, EVAL_MOBILITY_WEIGHT, CORNER_REGIONS,
+        )
+        BACKEND = "python"
+
+__all__ = [
+    "BACKEND", "Color", "BitboardOthello", "BoardSnapshot", "PlayoutPolicy", "SearchResult",
+    "EVAL_SQUARE_WEIGHTS", "EVAL_MOBILITY_WEIGHT", "CORNER_REGIONS",
+]
@@ -0,0 +1,490 @@
+"""othello コマンド
+
+    othello play --ai montecarlo          # 端末で AI と対局
+    othello match random montecarlo -n 10 # AI 同士の対戦
+    othello bench                         # 盤面操作と対局のスループット計測
+    othello analyze f5d6c3d3c4            # 棋譜の各手を評価
+    othello tune fit positions.bin        # 評価関数の重みを学習
+    othello gui                           # PySide6 の GUI
+    othello gui --spectate 24             # 24 局を並べて観戦
+
+起動を速くするため、このモジュールでは標準ライブラリ以外を import しない。
+盤面・AI・PySide6 は各サブコマンドの中で必要になってから読み込む。
+"""
+import argparse
+import sys
+import time
+from typing import List, Optional
+
+from modules import registry
+
+
+def render(othello) -> str:
+    """盤面を文字列にする (黒: ○, 白: ●)"""
+    lines = ["  a b c d e f g h"]
+    for y in range(8):
+        row = []
+        for x in range(8):
+            pos = 1 << (y * 8 + x)
+            if othello.black & pos:
+                row.append("○")
+            elif othello.white & pos:
+                row.append("●")
+            else:
+                row.append("・")
+        lines.append(f"{y + 1} " + " ".join(row))
+    return "\n".join(lines)
+
+
+def cmd_list(args) -> int:
+    for name in registry.available():
+        print(f"{name:12s} {registry.label(name)}")
+    return 0
+
+
+def cmd_play(args) -> int:
+    from modules.backend import Color, BitboardOthello
+    from modules.notation import format_move, parse_move
+
+    human_color = Color.BLACK if args.color == "black" else Color.WHITE
+    othello = BitboardOthello()
+    ai_player = registry.resolve(args.ai)(human_color.other, othello)
+
+    turn_color = Color.BLACK
+    pass_count = 0
+    while pass_count < 2:
+        if not othello.get_legal_moves_bits(turn_color):
+            pass_count += 1
+            turn_color = turn_color.other
+            continue
+        pass_count = 0
+
+        if turn_color == human_color:
+            print(render(othello))
+            legal = othello.get_legal_moves(turn_color)
+            while True:
+                try:
+                    text = input(f"あなたの番です ({' '.join(format_move(m) for m in legal)}): ")
+                except EOFError:
+                    return 1
+                try:
+                    move = parse_move(text)
+                except ValueError:
+                    move = None
+                if move is not None and move in [tuple(m) for m in legal]:
+                    break
+                print(f"{text.strip()} は打てません。")
+        else:
+            move = ai_player.place()
+            print(f"AI: {format_move(move)}")
+
+        othello.make_move(move[0], move[1], turn_color)
+        turn_color = turn_color.other
+
+    print(render(othello))
+    b, w = othello.count_stones()
+    print(f"黒: {b} | 白: {w}")
+    return 0
+
+
+def cmd_match(args) -> int:
+    if args.sprt:
+        return _match_sprt(args)
+
+    from modules.backend import Color
+    from modules.game import Game, play_seeded
+
+    black_ai = registry.resolve(args.black)
+    white_ai = registry.resolve(args.white)
+    results = {"BLACK": 0, "WHITE": 0, "DRAW": 0}
+
+    start_time = time.perf_counter()
+    for i in range(args.games):
+        if args.seed is None:
+            winner = Game(black_ai, white_ai).play()
+        else:
+            winner, _, _ = play_seeded(black_ai, white_ai, args.seed + i)
+
+        if winner == Color.BLACK:
+            results["BLACK"] += 1
+        elif winner == Color.WHITE:
+            results["WHITE"] += 1
+        else:
+            results["DRAW"] += 1
+    elapsed = time.perf_counter() - start_time
+
+    print("-" * 40)
+    print(f"対戦結果 ({args.games}戦):")
+    print(f"  黒 ({args.black}): {results['BLACK']} 勝")
+    print(f"  白 ({args.white}): {results['WHITE']} 勝")
+    print(f"  引き分け     : {results['DRAW']}")
+    print("-" * 40)
+    print(f"勝率 ({args.white}): {(results['WHITE'] / args.games) * 100:.2f}%")
+    print(f"総計算時間: {elapsed:.4f}s")
+    print(f"1試合平均 : {elapsed / args.games:.6f}s")
+    return 0
+
+
+def _bench_playouts(label: str, backend, playouts: int, seed: int) -> None:
+    """ランダムプレイアウトを繰り返して盤面操作の速さを測る"""
+    import random
+
+    Color, BitboardOthello = backend.Color, backend.BitboardOthello
+    random.seed(seed)
+    start_time = time.perf_counter()
+    plies = 0
+    for _ in range(playouts):
+        board = BitboardOthello()
+        color = Color.BLACK
+        pass_count = 0
+        while pass_count < 2:
+            moves = board.get_legal_moves(color)
+            if moves:
+                m = random.choice(moves)
+                board.make_move(m[0], m[1], color)
+                plies += 1
+                pass_count = 0
+            else:
+                pass_count += 1
+            color = color.other
+    elapsed = time.perf_counter() - start_time
+    print(f"playouts [{label}]: {playouts / elapsed:10.1f} /s  ({plies / elapsed:.0f} plies/s)")
+
+
+def _match_sprt(args) -> int:
+    from modules.sprt import format_result, run_sprt
+
+    # SPRT では 1 つ目を基準 (baseline)、2 つ目を挑戦者 (candidate) として先後を入れ替えて打つ
+    def progress(result) -> None:
+        lower, upper = result.bounds
+        print(f"\r{result.games} 局  LLR {result.llr:+.3f} [{lower:.2f}, {upper:.2f}]", end="", flush=True)
+
+    result = run_sprt(
+        args.black, args.white, args.elo0, args.elo1, args.alpha, args.beta, args.model,
+        args.batch, args.max_games, args.seed or 0, args.workers, progress,
+    )
+    print()
+    print(format_result(result, args.black, args.white))
+    return 0
+
+
+def _bench_playout_modes(args) -> None:
+    """プレイアウト方式ごとに、同じ相手・同じシミュレーション回数での勝率と CPU 時間を測る"""
+    from modules.ai import MonteCarloAI
+    from modules.backend import Color
+    from modules.game import play_seeded
+
+    opponent = registry.resolve(args.opponent)
+    print(f"vs {args.opponent}, {args.simulations} simulations/move, {args.games} games")
+    for mode in MonteCarloAI.PLAYOUT_MODES:
+        ai_class = type(f"MonteCarloAI_{mode}", (MonteCarloAI,),
+                        {"PLAYOUT": mode, "SIMULATIONS_PER_MOVE": args.simulations})
+        score = 0.0
+        start_cpu = time.process_time()
+        for i in range(args.games):
+            # 先後を交互に入れ替える
+            if i % 2 == 0:
+                winner, _, _ = play_seeded(ai_class, opponent, args.seed + i // 2)
+                me = Color.BLACK
+            else:
+                winner, _, _ = play_seeded(opponent, ai_class, args.seed + i // 2)
+                me = Color.WHITE
+            score += 0.5 if winner is None else float(winner == me)
+        cpu = time.process_time() - start_cpu
+        win_rate = score / args.games
+        print(f"  {mode:8s}: win {win_rate * 100:6.2f}%  cpu {cpu:8.3f}s  "
+              f"({cpu / args.games:.4f} s/game, {win_rate / cpu:.4f} win-rate/cpu-s)")
+
+
+def _bench_search(args) -> None:
+    """探索スレッド数ごとに、同じ局面を同じ深さまで読むのにかかる時間 (time-to-depth) を測る"""
+    import random
+    from modules.backend import BACKEND, Color, BitboardOthello
+
+    # 序盤を seed でランダムに進めた局面を使う
+    rng = random.Random(args.seed)
+    board = BitboardOthello()
+    color = Color.BLACK
+    for _ in range(args.opening):
+        moves = board.get_legal_moves(color)
+        if moves:
+            x, y = rng.choice(moves)
+            board.make_move(x, y, color)
+        color = color.other
+
+    threads_list = [int(t) for t in args.search_threads.split(",")]
+    print(f"search [{BACKEND}]: depth {args.depth}, hash {args.hash_mb} MB, {args.opening} plies opening")
+    base = None
+    for threads in threads_list:
+        result = board.search(color, args.depth, threads, args.hash_mb)
+        if base is None:
+            base = result.elapsed
+        print(f"  threads {threads:3d}: {result.elapsed:8.3f}s  speedup {base / result.elapsed:5.2f}x  "
+              f"nodes {result.nodes:>11d}  ({result.nodes / result.elapsed:,.0f} nps)  "
+              f"best {result.best_move} score {result.score}")
+        print("               time-to-depth: " + " ".join(f"{t:.3f}" for t in result.depth_times))
+
+
+def _bench_executors(args) -> None:
+    """ThreadPoolExecutor と ProcessPoolExecutor で、ワーカー数ごとの対局スループットを比べる"""
+    import os
+    from modules.backend import BACKEND
+    from modules.game import play_games
+
+    black_ai = registry.resolve(args.black)
+    white_ai = registry.resolve(args.white)
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"{args.black} vs {args.white}, {args.games} games, backend {BACKEND}, "
+          f"GIL {'enabled' if gil else 'disabled'}, {os.cpu_count()} CPUs")
+    counts = [int(n) for n in args.scaling.split(",")]
+    for executor in ("thread", "process"):
+        base = None
+        for workers in counts:
+            start_time = time.perf_counter()
+            play_games(black_ai, white_ai, args.games, workers, executor, args.seed)
+            elapsed = time.perf_counter() - start_time
+            rate = args.games / elapsed
+            if base is None:
+                base = rate
+            print(f"  {executor:7s} x{workers:<3d}: {rate:10.2f} games/s  (x{rate / base:.2f})")
+
+
+def cmd_bench(args) -> int:
+    import importlib
+    from modules import backend
+    from modules.game import play_seeded
+
+    if args.playout_modes:
+        _bench_playout_modes(args)
+        return 0
+    if args.search_threads:
+        _bench_search(args)
+        return 0
+    if args.scaling:
+        _bench_executors(args)
+        return 0
+
+    # 盤面操作: --compare なら両方の実装を測る
+    if args.compare:
+        for label, name in (("rust", "othello_rust"), ("python", "modules.pybitboard")):
+            try:
+                module = importlib.import_module(name)
+            except ImportError:
+                print(f"playouts [{label}]: (not available)")
+                continue
+            _bench_playouts(label, module, args.playouts, args.seed)
+    else:
+        _bench_playouts(backend.BACKEND, backend, args.playouts, args.seed)
+
+    # 対局: AI の思考を含めたスループット
+    black_ai = registry.resolve(args.black)
+    white_ai = registry.resolve(args.white)
+    start_time = time.perf_counter()
+    for i in range(args.games):
+        play_seeded(black_ai, white_ai, args.seed + i)
+    elapsed = time.perf_counter() - start_time
+    print(f"games ({args.black} vs {args.white}): {args.games / elapsed:10.1f} /s")
+    return 0
+
+
+def cmd_parity(args) -> int:
+    from modules import parity, pybitboard
+
+    try:
+        import othello_rust
+    except ModuleNotFoundError:
+        print("othello_rust is not installed (build it with 'maturin develop --release')")
+        return 2
+
+    start_time = time.perf_counter()
+    results = parity.run(othello_rust, pybitboard, args.positions, args.depth, args.threads,
+                         args.playouts, args.playout_positions, args.seed)
+    failed = 0
+    for name in parity.CHECKS:
+        errors = results[name]
+        print(f"{name:10s}: {'OK' if not errors else f'{len(errors)} mismatches'}")
+        for error in errors[:5]:
+            print(f"  {error}")
+        failed += len(errors)
+    print(f"{time.perf_counter() - start_time:.1f}s")
+    return 1 if failed else 0
+
+
+def cmd_analyze(args) -> int:
+    from modules.backend import Color
+    from modules.analysis import analyze, iter_games
+    from modules.notation import format_move, parse_moves
+
+    games = iter_games(args.file) if args.file else [parse_moves(args.moves)]
+
+    annotations = analyze(games, args.ai, args.simulations, args.workers, args.window)
+    print("game\tply\tcolor\tmove\tbest\tvalue\tbest_value\tloss")
+    for a in annotations:
+        print(f"{a.game}\t{a.ply}\t{'B' if a.color == Color.BLACK else 'W'}\t"
+              f"{format_move(a.move)}\t{format_move(a.best)}\t"
+              f"{a.value:.3f}\t{a.best_value:.3f}\t{a.loss:.3f}", flush=True)
+    return 0
+
+
+def cmd_tune(args) -> int:
+    from modules import tune
+
+    if args.tune_command == "generate":
+        def progress(games: int, positions: int) -> None:
+            print(f"\r{games}/{args.games} 局  {positions} 局面", end="", flush=True)
+
+        tune.generate(args.out, args.games, args.ai, args.workers, args.seed, args.random_plies,
+                      callback=progress)
+        print()
+    elif args.tune_command == "convert":
+        from modules.analysis import iter_games
+
+        print(f"{tune.convert(iter_games(args.file), args.out, args.seed)} 局面")
+    else:
+        def progress(epoch: int, result) -> None:
+            validation = f"  検証 {result.validation_loss[-1]:.5f}" if result.validation_loss else ""
+            print(f"epoch {epoch + 1}: 損失 {result.train_loss[-1]:.5f}{validation}  ({result.steps} steps)")
+
+        start_time = time.perf_counter()
+        result = tune.fit(args.positions, args.epochs, args.batch, args.lr, args.workers,
+                          args.validation, args.seed, args.init, progress)
+        tune.export(result, args.out)
+        weights = result.weights()
+        print(f"{result.positions} 局面, {time.perf_counter() - start_time:.1f}s -> {args.out}")
+        print(f"  mobility {weights['mobility']}  pattern (X, C) {weights['pattern']}")
+        for y in range(8):
+            print("  " + " ".join(f"{w:5d}" for w in weights["eval"][y * 8:y * 8 + 8]))
+    return 0
+
+
+def cmd_gui(args) -> int:
+    import importlib
+
+    # PySide6 はここで初めて読み込まれる
+    if args.human:
+        return importlib.import_module("modules.taisen_gui").main()
+    return importlib.import_module("modules.ai_gui").main(spectate=args.spectate)
+
+
+def _positive_int(text: str) -> int:
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be >= 1: {text}")
+    return value
+
+
+def _ai_name(text: str) -> str:
+    # 名前の確認だけなので AI のモジュールは import しない
+    names = registry.available()
+    if text not in names:
+        raise argparse.ArgumentTypeError(f"unknown AI: {text} (available: {', '.join(names)})")
+    return text
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="othello", description="Rust Othello")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("list", help="利用できる AI の一覧")
+    p.set_defaults(func=cmd_list)
+
+    p = sub.add_parser("play", help="端末で AI と対局する")
+    p.add_argument("--ai", type=_ai_name, default="montecarlo")
+    p.add_argument("--color", choices=["black", "white"], default="black", help="あなたの石の色")
+    p.set_defaults(func=cmd_play)
+
+    p = sub.add_parser("match", help="AI 同士を対戦させる")
+    p.add_argument("black", nargs="?", type=_ai_name, default="random")
+    p.add_argument("white", nargs="?", type=_ai_name, default="montecarlo")
+    p.add_argument("-n", "--games", type=_positive_int, default=10)
+    p.add_argument("--seed", type=int, default=None, help="指定すると i 局目をシード seed+i で打つ")
+    p.add_argument("--sprt", action="store_true", help="SPRT で勝敗が決まり次第打ち切る (2つ目の AI を挑戦者とする)")
+    p.add_argument("--elo0", type=float, default=0.0)
+    p.add_argument("--elo1", type=float, default=20.0)
+    p.add_argument("--alpha", type=float, default=0.05)
+    p.add_argument("--beta", type=float, default=0.05)
+    p.add_argument("--model", choices=["pentanomial", "trinomial"], default="pentanomial")
+    p.add_argument("--batch", type=int, default=8, help="1 バッチあたりのペア数")
+    p.add_argument("--max-games", type=int, default=20000)
+    p.add_argument("--workers", type=int, default=1, help="SPRT のワーカープロセス数")
+    p.set_defaults(func=cmd_match)
+
+    p = sub.add_parser("bench", help="スループットを計測する")
+    p.add_argument("--playouts", type=int, default=1000)
+    p.add_argument("--compare", action="store_true", help="Rust 実装と純 Python 実装の両方を測る")
+    p.add_argument("--playout-modes", action="store_true",
+                   help="MonteCarloAI のプレイアウト方式 (python/uniform/heavy) を比べる")
+    p.add_argument("--opponent", type=_ai_name, default="yosumi", help="--playout-modes の対戦相手")
+    p.add_argument("--simulations", type=int, default=50, help="--playout-modes の 1 手あたりのプレイアウト数")
+    p.add_argument("--search-threads", default=None, metavar="1,2,4",
+                   help="alpha-beta 探索の time-to-depth をスレッド数ごとに測る")
+    p.add_argument("--depth", type=int, default=10, help="--search-threads の探索深さ")
+    p.add_argument("--hash-mb", type=int, default=64, help="--search-threads の置換表サイズ")
+    p.add_argument("--opening", type=int, default=12, help="--search-threads で局面を作るランダムな手数")
+    p.add_argument("--scaling", default=None, metavar="1,2,4",
+                   help="スレッドプールとプロセスプールで、ワーカー数ごとの対局スループットを測る")
+    p.add_argument("--black", type=_ai_name, default="random")
+    p.add_argument("--white", type=_ai_name, default="random")
+    p.add_argument("-n", "--games", type=_positive_int, default=200)
+    p.add_argument("--seed", type=int, default=0)
+    p.set_defaults(func=cmd_bench)
+
+    p = sub.add_parser("parity", help="Rust 拡張と純 Python 実装の結果を突き合わせる")
+    p.add_argument("--positions", type=_positive_int, default=100, help="調べる局面数")
+    p.add_argument("--depth", type=_positive_int, default=4, help="search の深さ")
+    p.add_argument("--threads", type=_positive_int, default=1, help="Rust 側の search のスレッド数")
+    p.add_argument("--playouts", type=_positive_int, default=2000, help="1 局面あたりのプレイアウト数")
+    p.add_argument("--playout-positions", type=int, default=10, help="playout_wins を比べる局面数")
+    p.add_argument("--seed", type=int, default=0)
+    p.set_defaults(func=cmd_parity)
+
+    p = sub.add_parser("analyze", help="棋譜の各手を評価する")
+    p.add_argument("moves", nargs="?", default="", help='棋譜 (例: "f5d6c3d3c4")')
+    p.add_argument("--file", help="1 行 1 局の棋譜ファイル")
+    p.add_argument("--ai", type=_ai_name, default="montecarlo", help="evaluate_moves() を持つ AI")
+    p.add_argument("--simulations", type=int, default=50)
+    p.add_argument("--workers", type=int, default=None, help="ワーカープロセス数 (既定: CPU数)")
+    p.add_argument("--window", type=int, default=256, help="同時に評価待ちにする局面数の上限")
+    p.set_defaults(func=cmd_analyze)
+
+    p = sub.add_parser("tune", help="評価関数の重みを自己対局の局面から調整する (NumPy が必要)")
+    tune_sub = p.add_subparsers(dest="tune_command", required=True)
+    t = tune_sub.add_parser("generate", help="自己対局で局面ファイルを作る (追記)")
+    t.add_argument("out")
+    t.add_argument("--games", type=int, default=10000)
+    t.add_argument("--ai", type=_ai_name, default="random")
+    t.add_argument("--random-plies", type=int, default=8, help="序盤にランダムに打つ手数")
+    t.add_argument("--workers", type=int, default=None, help="ワーカープロセス数 (既定: CPU数)")
+    t.add_argument("--seed", type=int, default=0)
+    t = tune_sub.add_parser("convert", help="棋譜ファイル (1 行 1 局) から局面ファイルを作る (追記)")
+    t.add_argument("file")
+    t.add_argument("out")
+    t.add_argument("--seed", type=int, default=0)
+    t = tune_sub.add_parser("fit", help="局面ファイルから重みを学習して書き出す")
+    t.add_argument("positions")
+    t.add_argument("--out", default="eval.json")
+    t.add_argument("--epochs", type=int, default=3)
+    t.add_argument("--batch", type=int, default=65536)
+    t.add_argument("--lr", type=float, default=0.5)
+    t.add_argument("--workers", type=int, default=1, help="勾配を計算するプロセス数")
+    t.add_argument("--validation", type=float, default=0.05, help="検証に使う局面の割合")
+    t.add_argument("--init", default=None, help="初期値にする重みファイル")
+    t.add_argument("--seed", type=int, default=0)
+    p.set_defaults(func=cmd_tune)
+
+    p = sub.add_parser("gui", help="GUI を起動する")
+    p.add_argument("--human", action="store_true", help="人間 vs AI の対局画面")
+    p.add_argument("--spectate", type=int, default=0, metavar="N",
+                   help="N 個の対局を並行して進めて観戦する (全コアを使う)")
+    p.set_defaults(func=cmd_gui)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,325 @@
+"""複数マシンで対局を分散実行するコーディネーター / ワーカー
+
+コーディネーターは Game のジョブ (AIの組み合わせ・シード・手番) をバッチ単位で
+TCP 越しに配り、ワーカーはレジストリ (modules/registry.py) の AI で対局して結果を送り返す。
+通信は 1 行 1 JSON の単純なリクエスト/レスポンス形式。
+
+    # コーディネーター (ローカルにワーカーを4つ起動して試す場合)
+    python -m modules.distributed coordinator --black random --white montecarlo \\
+        --games 100 --port 5555 --local-workers 4
+
+    # 別マシンのワーカー
+    python -m modules.distributed worker --host 192.168.0.10 --port 5555 --processes 8
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import socket
+import socketserver
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional, Tuple
+
+from modules import registry
+from modules.game import play_seeded
+from modules.backend import Color
+
+
+def winner_code(winner: Optional[Color]) -> str:
+    """結果の勝者コード (通信量を減らすため1文字で送る)"""
+    if winner is None:
+        return "D"
+    if winner == Color.BLACK:
+        return "B"
+    return "W"
+
+
+@dataclass
+class Job:
+    job_id: int
+    black: str
+    white: str
+    seed: int
+
+    def to_wire(self) -> list:
+        return [self.job_id, self.black, self.white, self.seed]
+
+
+@dataclass
+class WorkerStats:
+    games: int = 0
+    busy: float = 0.0  # ワーカー側で計測した対局時間の合計
+    first_seen: float = 0.0
+    last_seen: float = 0.0
+
+    def games_per_sec(self) -> float:
+        return self.games / self.busy if self.busy > 0 else 0.0
+
+
+def make_job(job_id: int, ai_a: str, ai_b: str, base_seed: int = 0) -> Job:
+    """job_id 番目のジョブ (偶数番目は ai_a が黒、奇数番目は同じシードで先後を入れ替える)"""
+    black, white = (ai_a, ai_b) if job_id % 2 == 0 else (ai_b, ai_a)
+    return Job(job_id, black, white, base_seed + job_id // 2)
+
+
+def make_jobs(ai_a: str, ai_b: str, num_games: int, base_seed: int = 0) -> List[Job]:
+    """同じシードで先後を入れ替えたペアを並べたジョブ列を作る"""
+    return [make_job(i, ai_a, ai_b, base_seed) for i in range(num_games)]
+
+
+def run_job(job: Job) -> list:
+    """1局打って [job_id, 勝者コード, 黒石数, 白石数] を返す"""
+    winner, black_count, white_count = play_seeded(
+        registry.resolve(job.black), registry.resolve(job.white), job.seed
+    )
+    return [job.job_id, winner_code(winner), black_count, white_count]
+
+
+class Coordinator:
+    """ジョブの払い出し・期限切れの再発行・結果の重複排除を行う
+
+    ワーカーへの配信は at-least-once (期限切れのジョブは別のワーカーに再発行する)。
+    結果は job_id で重複排除するので、集計は exactly-once になる。
+    """
+
+    def __init__(self, jobs: List[Job], batch_size: int = 4, lease_timeout: float = 120.0) -> None:
+        self.jobs: Dict[int, Job] = {job.job_id: job for job in jobs}
+        self.pending: Deque[Job] = deque(jobs)
+        self.leases: Dict[int, Tuple[str, float]] = {}  # job_id -> (ワーカー名, 期限)
+        self.results: Dict[int, list] = {}
+        self.stats: Dict[str, WorkerStats] = {}
+        self.batch_size = batch_size
+        self.lease_timeout = lease_timeout
+        self.reissued = 0
+        self.duplicates = 0
+        self.start_time = time.monotonic()
+        self.finished = threading.Event()
+        self.lock = threading.Lock()
+        if not self.jobs:
+            self.finished.set()
+
+    def handle(self, worker: str, results: List[list], elapsed: float) -> dict:
+        """ワーカーから結果を受け取り、次のバッチ (または待機/終了) を返す"""
+        now = time.monotonic()
+        with self.lock:
+            self._submit(worker, results, elapsed, now)
+            if self.finished.is_set():
+                return {"op": "done"}
+
+            self._reap(now)
+            batch = self._next_batch(worker, now)
+            if batch:
+                return {"op": "batch", "jobs": [job.to_wire() for job in batch]}
+
+            # 未発行のジョブは無いが、他のワーカーが処理中のものが残っている
+            next_deadline = min((deadline for _, deadline in self.leases.values()), default=now + 1.0)
+            return {"op": "wait", "delay": max(0.1, min(1.0, next_deadline - now))}
+
+    def _submit(self, worker: str, results: List[list], elapsed: float, now: float) -> None:
+        stats = self.stats.get(worker)
+        if stats is None:
+            stats = self.stats[worker] = WorkerStats(first_seen=now)
+        stats.last_seen = now
+        stats.busy += elapsed
+
+        for result in results:
+            job_id = result[0]
+            if job_id not in self.jobs or job_id in self.results:
+                self.duplicates += 1
+                continue
+            self.results[job_id] = result
+            self.leases.pop(job_id, None)
+            stats.games += 1
+
+        if len(self.results) == len(self.jobs):
+            self.finished.set()
+
+    def _reap(self, now: float) -> None:
+        """期限切れのジョブを未発行キューの先頭に戻す"""
+        expired = [job_id for job_id, (_, deadline) in self.leases.items() if deadline <= now]
+        for job_id in expired:
+            del self.leases[job_id]
+        self.pending.extendleft(self.jobs[job_id] for job_id in reversed(expired))
+        self.reissued += len(expired)
+
+    def _next_batch(self, worker: str, now: float) -> List[Job]:
+        batch = []
+        while self.pending and len(batch) < self.batch_size:
+            job = self.pending.popleft()
+            # 再発行後に元のワーカーから結果が届いている場合は飛ばす
+            if job.job_id in self.results or job.job_id in self.leases:
+                continue
+            batch.append(job)
+        deadline = now + self.lease_timeout
+        for job in batch:
+            self.leases[job.job_id] = (worker, deadline)
+        return batch
+
+    def summary(self) -> dict:
+        """AIごとの勝敗とワーカーごとのスループットを集計する"""
+        with self.lock:
+            wins: Dict[str, int] = {}
+            draws = 0
+            for job_id, (_, code, _, _) in self.results.items():
+                job = self.jobs[job_id]
+                if code == "D":
+                    draws += 1
+                    continue
+                name = job.black if code == "B" else job.white
+                wins[name] = wins.get(name, 0) + 1
+            return {
+                "games": len(self.results),
+                "wins": wins,
+                "draws": draws,
+                "reissued": self.reissued,
+                "duplicates": self.duplicates,
+                "elapsed": time.monotonic() - self.start_time,
+                "workers": {
+                    name: {"games": s.games, "games_per_sec": s.games_per_sec()}
+                    for name, s in sorted(self.stats.items())
+                },
+            }
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        coordinator: Coordinator = self.server.coordinator  # type: ignore[attr-defined]
+        for line in self.rfile:
+            msg = json.loads(line)
+            reply = coordinator.handle(msg["worker"], msg.get("results", []), msg.get("elapsed", 0.0))
+            self.wfile.write(json.dumps(reply).encode() + b"\n")
+            self.wfile.flush()
+            if reply["op"] == "done":
+                return
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def serve(coordinator: Coordinator, host: str, port: int, local_workers: int = 0) -> dict:
+    """全ジョブの結果が揃うまでコーディネーターを動かし、集計結果を返す"""
+    with _Server((host, port), _Handler) as server:
+        server.coordinator = coordinator  # type: ignore[attr-defined]
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+
+        bound_port = server.server_address[1]
+        workers = [
+            multiprocessing.Process(target=run_worker, args=("127.0.0.1", bound_port), daemon=True)
+            for _ in range(local_workers)
+        ]
+        for p in workers:
+            p.start()
+
+        coordinator.finished.wait()
+        # ローカルワーカーが "done" を受け取って終了するのを待つ
+        for p in workers:
+            p.join(timeout=5.0)
+        server.shutdown()
+    return coordinator.summary()
+
+
+def run_worker(host: str, port: int, name: Optional[str] = None, connect_timeout: float = 30.0) -> int:
+    """コーディネーターからジョブを受け取り続けて対局する。処理した対局数を返す"""
+    name = name or f"{socket.gethostname()}:{os.getpid()}"
+
+    # コーディネーターの起動を待つ
+    deadline = time.monotonic() + connect_timeout
+    while True:
+        try:
+            sock = socket.create_connection((host, port))
+            break
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.5)
+
+    played = 0
+    with sock, sock.makefile("rwb") as f:
+        results: List[list] = []
+        elapsed = 0.0
+        while True:
+            msg = {"worker": name, "results": results, "elapsed": elapsed}
+            f.write(json.dumps(msg).encode() + b"\n")
+            f.flush()
+            line = f.readline()
+            if not line:
+                break  # コーディネーターが終了した
+            reply = json.loads(line)
+
+            results, elapsed = [], 0.0
+            if reply["op"] == "done":
+                break
+            if reply["op"] == "wait":
+                time.sleep(reply["delay"])
+                continue
+
+            start = time.perf_counter()
+            results = [run_job(Job(*wire)) for wire in reply["jobs"]]
+            elapsed = time.perf_counter() - start
+            played += len(results)
+    return played
+
+
+def print_summary(summary: dict) -> None:
+    print("-" * 40)
+    print(f"対局数: {summary['games']}  (再発行 {summary['reissued']} / 重複破棄 {summary['duplicates']})")
+    for name, count in sorted(summary["wins"].items()):
+        print(f"  {name}: {count} 勝")
+    print(f"  引き分け: {summary['draws']}")
+    print("-" * 40)
+    for worker, s in summary["workers"].items():
+        print(f"  {worker}: {s['games']} 局, {s['games_per_sec']:.3f} games/sec")
+    total = summary["games"] / summary["elapsed"] if summary["elapsed"] > 0 else 0.0
+    print(f"総計算時間: {summary['elapsed']:.2f}s  ({total:.3f} games/sec)")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="分散対局のコーディネーター / ワーカー")
+    sub = parser.add_subparsers(dest="role", required=True)
+
+    c = sub.add_parser("coordinator")
+    c.add_argument("--black", default="random")
+    c.add_argument("--white", default="montecarlo")
+    c.add_argument("--games", type=int, default=100)
+    c.add_argument("--seed", type=int, default=0)
+    c.add_argument("--host", default="0.0.0.0")
+    c.add_argument("--port", type=int, default=5555)
+    c.add_argument("--batch-size", type=int, default=4)
+    c.add_argument("--lease-timeout", type=float, default=120.0)
+    c.add_argument("--local-workers", type=int, default=0)
+
+    w = sub.add_parser("worker")
+    w.add_argument("--host", default="127.0.0.1")
+    w.add_argument("--port", type=int, default=5555)
+    w.add_argument("--processes", type=int, default=1)
+
+    args = parser.parse_args(argv)
+    if args.role == "coordinator":
+        # 未知の AI 名はジョブを配る前に弾く
+        for name in (args.black, args.white):
+            try:
+                registry.resolve(name)
+            except ValueError as e:
+                parser.error(str(e))
+        jobs = make_jobs(args.black, args.white, args.games, args.seed)
+        coordinator = Coordinator(jobs, args.batch_size, args.lease_timeout)
+        print_summary(serve(coordinator, args.host, args.port, args.local_workers))
+    else:
+        procs = [
+            multiprocessing.Process(target=run_worker, args=(args.host, args.port))
+            for _ in range(args.processes)
+        ]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join()
+
+
+if __name__ == "__main__":
+    main()
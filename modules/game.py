@@ -1,5 +1,7 @@
-from othello_rust import Color, BitboardOthello
-from typing import Optional
+from modules.backend import Color, BitboardOthello
+from modules.state import GameFeed
+from typing import Iterator, List, Optional, Tuple
+import random
 
 class Game:
     def __init__(self, black_ai_class, white_ai_class) -> None:
@@ -7,6 +9,10 @@ class Game:
         self.othello = BitboardOthello()
         self.black_ai = black_ai_class(Color.BLACK, self.othello)
         self.white_ai = white_ai_class(Color.WHITE, self.othello)
+        # 棋譜 (パスは None)
+        self.moves: List[Optional[Tuple[int, int]]] = []
+        # 他のスレッドから読む用の盤面 (1 手ごとに不変のスナップショットを公開する)
+        self.feed = GameFeed(self.othello)
 
     def play(self) -> Optional[Color]:
         """終局まで進めて勝者を返す"""
@@ -16,7 +22,8 @@ class Game:
         while pass_count < 2:
             current_ai = self.black_ai if turn_color == Color.BLACK else self.white_ai
             move = current_ai.place()
-            
+            self.moves.append(move)
+
             if move:
                 x, y = move
                 # Rust側の make_move を呼び出し
@@ -27,7 +34,9 @@ class Game:
 
             # ターン交代
             turn_color = Color.WHITE if turn_color == Color.BLACK else Color.BLACK
+            self.feed.publish(self.othello, turn_color, move)
 
+        self.feed.publish(self.othello, None)
         return self.winner()
 
     def winner(self) -> Optional[Color]:
@@ -41,3 +50,75 @@ class Game:
             return Color.WHITE
         else:
             return None  # Draw
+
+
+def play_seeded(black_ai_class, white_ai_class, seed: Optional[int]) -> Tuple[Optional[Color], int, int]:
+    """乱数シードを固定して1局打ち、(勝者, 黒石数, 白石数) を返す (seed が None なら固定しない)"""
+    if seed is not None:
+        random.seed(seed)
+    game = Game(black_ai_class, white_ai_class)
+    winner = game.play()
+    black_count, white_count = game.othello.count_stones()
+    return winner, black_count, white_count
+
+
+def _play_counts(black_ai_class, white_ai_class, seed: Optional[int]) -> Tuple[int, int]:
+    """1局打って (黒石数, 白石数) を返す (Color は別プロセスから返せないので石数だけ)"""
+    _, black_count, white_count = play_seeded(black_ai_class, white_ai_class, seed)
+    return black_count, white_count
+
+
+def play_games(black_ai_class, white_ai_class, num_games: int, workers: Optional[int] = None,
+               executor: str = "thread", seed: Optional[int] = None) -> List[Tuple[Optional[Color], int, int]]:
+    """num_games 局を並行して打ち、各局の (勝者, 黒石数, 白石数) を順番に返す
+
+    executor="thread" なら ThreadPoolExecutor で、"process" なら ProcessPoolExecutor で打つ。
+    スレッドの場合、1 局ごとに別の Game (別の盤面) を使うので盤面は共有しないが、
+    AI が使う random は全スレッドで共有されるため seed を指定しても結果は再現しない
+    (seed はプロセスの場合だけ使う)。
+    GIL のある Python でスレッドが並列に動くのは、拡張モジュール側で GIL を解放している
+    処理 (playout_wins, search など) の間だけ。free-threaded 版の Python なら AI の Python
+    部分も並列に動く。
+    """
+    # multiprocessing の読み込みは重いので、並行対局を使うときだけ import する
+    from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+    pool: Executor
+    if executor == "thread":
+        pool = ThreadPoolExecutor(workers)
+        seeds = [None] * num_games
+    elif executor == "process":
+        pool = ProcessPoolExecutor(workers)
+        seeds = [None if seed is None else seed + i for i in range(num_games)]
+    else:
+        raise ValueError(f"unknown executor: {executor}")
+
+    results = []
+    with pool:
+        for black_count, white_count in pool.map(
+            _play_counts, [black_ai_class] * num_games, [white_ai_class] * num_games, seeds
+        ):
+            if black_count > white_count:
+                winner = Color.BLACK
+            elif white_count > black_count:
+                winner = Color.WHITE
+            else:
+                winner = None
+            results.append((winner, black_count, white_count))
+    return results
+
+
+def replay_moves(moves: List[Optional[Tuple[int, int]]]) -> Iterator[Tuple[BitboardOthello, Color, Optional[Tuple[int, int]]]]:
+    """棋譜を初期局面から再生し、各手の (着手前の盤面, 手番, 着手) を順に返す
+
+    打てる手が無い側のパスは棋譜に書かれていなくても補う。
+    """
+    othello = BitboardOthello()
+    turn_color = Color.BLACK
+    for move in moves:
+        if move is not None and not othello.get_legal_moves_bits(turn_color):
+            turn_color = turn_color.other
+        yield othello.copy(), turn_color, move
+        if move is not None and not othello.make_move(move[0], move[1], turn_color):
+            raise ValueError(f"illegal move {move} for {turn_color!r}")
+        turn_color = turn_color.other
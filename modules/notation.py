@@ -0,0 +1,44 @@
+"""棋譜の文字列表記 ("f5d6c3..." 形式) と座標の相互変換
+
+列は a-h が x=0..7、行は 1-8 が y=0..7 に対応する。パスは "pa" または "--"。
+"""
+import re
+from typing import List, Optional, Tuple
+
+Move = Optional[Tuple[int, int]]
+
+_TOKEN = re.compile(r"([a-hA-H][1-8])|(pa|PA|--)")
+
+
+def parse_move(token: str) -> Move:
+    token = token.strip()
+    if token.lower() in ("pa", "--"):
+        return None
+    if len(token) != 2 or not _TOKEN.fullmatch(token):
+        raise ValueError(f"invalid move: {token!r}")
+    return ord(token[0].lower()) - ord("a"), int(token[1]) - 1
+
+
+def parse_moves(text: str) -> List[Move]:
+    """棋譜文字列を手のリストに変換する (区切り文字は無視する)"""
+    moves = []
+    pos = 0
+    for m in _TOKEN.finditer(text):
+        if text[pos:m.start()].strip(" ,;\t\r\n"):
+            raise ValueError(f"invalid move sequence near {text[pos:m.start()]!r}")
+        moves.append(parse_move(m.group(0)))
+        pos = m.end()
+    if text[pos:].strip(" ,;\t\r\n"):
+        raise ValueError(f"invalid move sequence near {text[pos:]!r}")
+    return moves
+
+
+def format_move(move: Move) -> str:
+    if move is None:
+        return "pa"
+    x, y = move
+    return f"{'abcdefgh'[x]}{y + 1}"
+
+
+def format_moves(moves: List[Move]) -> str:
+    return "".join(format_move(m) for m in moves)
@@ -0,0 +1,206 @@
+"""Rust 拡張 (othello_rust) と純 Python 実装 (modules/pybitboard.py) の突き合わせ
+
+同じ局面を両方の実装に渡し、結果が食い違わないかを調べる。Rust 側をビルドし直したら
+まずこれを流す。
+
+    othello parity --positions 200 --depth 4
+
+- 盤面操作: 合法手・着手後の盤面・石数が一致すること
+- search: 評価関数の既定値と、同じ深さの評価値が一致すること。最善手が違う場合は、Rust の手を
+  Python 側で読み直して同じ評価値になること (同点の手はどちらを選んでもよい)
+- playout_wins: 乱数の作り方が違うので一致はしない。同じシードなら同じ結果になることと、
+  勝率の差が許容範囲に収まることだけを見る (一様と重み付きの両方)
+- PlayoutPolicy: 同じ重みを受け付け、小数・負の値・u32 を超える値は同じ例外で弾くこと
+- BoardSnapshot: 同じ盤面どうしが等しく同じハッシュになり、辞書のキーに使えること。
+  (black, white) のタプルとは等しくならないこと
+- Color: ハッシュでき、辞書や集合のキーに使えること
+"""
+import math
+import random
+from typing import Dict, List, Tuple
+
+# 局面: (黒, 白, 手番 0/1)
+Position = Tuple[int, int, int]
+
+CHECKS = ("board", "search", "playout", "snapshot", "color")
+
+
+def random_positions(py, count: int, seed: int) -> List[Position]:
+    """ランダムに打ち進めた、手番側に合法手がある局面を count 個作る"""
+    rng = random.Random(seed)
+    colors = (py.Color.BLACK, py.Color.WHITE)
+    positions: List[Position] = []
+    while len(positions) < count:
+        board = py.BitboardOthello()
+        turn = 0
+        plies = rng.randrange(4, 50)
+        for _ in range(plies):
+            moves = board.get_legal_moves(colors[turn])
+            if not moves:
+                turn ^= 1
+                moves = board.get_legal_moves(colors[turn])
+                if not moves:
+                    break
+            x, y = rng.choice(moves)
+            board.make_move(x, y, colors[turn])
+            turn ^= 1
+        if board.get_legal_moves_bits(colors[turn]):
+            positions.append((board.black, board.white, turn))
+    return positions
+
+
+def check_board(rs, py, positions: List[Position]) -> List[str]:
+    errors = []
+    for black, white, turn in positions:
+        a = rs.BitboardOthello.from_bits(black, white)
+        b = py.BitboardOthello.from_bits(black, white)
+        ca, cb = (rs.Color.BLACK, rs.Color.WHITE)[turn], (py.Color.BLACK, py.Color.WHITE)[turn]
+        if a.get_legal_moves_bits(ca) != b.get_legal_moves_bits(cb):
+            errors.append(f"legal moves differ at {black:#x} {white:#x} turn {turn}")
+            continue
+        if sorted(a.get_legal_moves(ca)) != sorted(b.get_legal_moves(cb)):
+            errors.append(f"get_legal_moves differs at {black:#x} {white:#x} turn {turn}")
+        for x, y in b.get_legal_moves(cb):
+            a2, b2 = a.copy(), b.copy()
+            if a2.make_move(x, y, ca) != b2.make_move(x, y, cb) or (a2.black, a2.white) != (b2.black, b2.white):
+                errors.append(f"make_move {(x, y)} differs at {black:#x} {white:#x} turn {turn}")
+        if a.count_stones() != b.count_stones():
+            errors.append(f"count_stones differs at {black:#x} {white:#x}")
+    return errors
+
+
+def _exact_value(py, black: int, white: int, turn: int, move: Tuple[int, int], depth: int) -> int:
+    """手番側が move を打ったあとの局面を depth-1 手読んだ評価値 (手番側から見た値)"""
+    colors = (py.Color.BLACK, py.Color.WHITE)
+    board = py.BitboardOthello.from_bits(black, white)
+    board.make_move(move[0], move[1], colors[turn])
+    me, opp = (board.black, board.white) if turn == 0 else (board.white, board.black)
+    search = py._Search(list(py.EVAL_SQUARE_WEIGHTS), py.EVAL_MOBILITY_WEIGHT)
+    return -search.negamax(opp, me, depth - 1, -py._INF, py._INF)
+
+
+def check_search(rs, py, positions: List[Position], depth: int, threads: int) -> List[str]:
+    errors = []
+    for name in ("EVAL_SQUARE_WEIGHTS", "EVAL_MOBILITY_WEIGHT", "CORNER_REGIONS"):
+        if getattr(rs, name) != getattr(py, name):
+            errors.append(f"{name} differs")
+    for black, white, turn in positions:
+        a = rs.BitboardOthello.from_bits(black, white).search((rs.Color.BLACK, rs.Color.WHITE)[turn], depth, threads)
+        b = py.BitboardOthello.from_bits(black, white).search((py.Color.BLACK, py.Color.WHITE)[turn], depth)
+        where = f"{black:#x} {white:#x} turn {turn} depth {depth}"
+        if a.depth != b.depth:
+            errors.append(f"search depth {a.depth} != {b.depth} at {where}")
+        elif a.score != b.score:
+            errors.append(f"search score {a.score} != {b.score} at {where}")
+        elif a.best_move != b.best_move:
+            value = _exact_value(py, black, white, turn, tuple(a.best_move), depth)
+            if value != b.score:
+                errors.append(f"search best move {a.best_move} scores {value}, not {b.score}, at {where}")
+    return errors
+
+
+# PlayoutPolicy に渡すと両方の実装で弾かれるべき重み (先頭のマスだけ変える)
+BAD_POLICY_WEIGHTS = (1.5, -1, 2 ** 32, "1")
+
+
+def check_policy(rs, py) -> List[str]:
+    errors = []
+    weights = [(sq * 7) % 13 for sq in range(64)]
+    if list(rs.PlayoutPolicy(weights).weights) != list(py.PlayoutPolicy(weights).weights):
+        errors.append("PlayoutPolicy weights differ")
+    for bad in BAD_POLICY_WEIGHTS:
+        raised = []
+        for module in (rs, py):
+            try:
+                module.PlayoutPolicy([bad] + weights[1:])
+                raised.append(None)
+            except (TypeError, ValueError, OverflowError) as e:
+                raised.append(type(e))
+        if raised[0] is None or raised[1] is None or raised[0] is not raised[1]:
+            names = [t.__name__ if t else "accepted" for t in raised]
+            errors.append(f"PlayoutPolicy({bad!r}): rust {names[0]}, python {names[1]}")
+    return errors
+
+
+def check_playout(rs, py, positions: List[Position], playouts: int, seed: int) -> List[str]:
+    errors = check_policy(rs, py)
+    # 勝率の差の許容範囲: 両側の標準誤差を合わせた 5 シグマ
+    tolerance = 5 * math.sqrt(2 * 0.25 / playouts)
+    # 隅を重くした重み付きプレイアウトも比べる
+    weights = [20 if sq in (0, 7, 56, 63) else 1 for sq in range(64)]
+    policies = ((None, None), (rs.PlayoutPolicy(weights), py.PlayoutPolicy(weights)))
+    for (black, white, turn), (pa, pb) in ((p, q) for p in positions for q in policies):
+        a = rs.BitboardOthello.from_bits(black, white)
+        b = py.BitboardOthello.from_bits(black, white)
+        ca, cb = (rs.Color.BLACK, rs.Color.WHITE)[turn], (py.Color.BLACK, py.Color.WHITE)[turn]
+        ra = a.playout_wins(ca, ca, playouts, pa, seed)
+        rb = b.playout_wins(cb, cb, playouts, pb, seed)
+        where = f"{black:#x} {white:#x} turn {turn}{'' if pa is None else ' weighted'}"
+        if a.playout_wins(ca, ca, playouts, pa, seed) != ra:
+            errors.append(f"playout_wins is not deterministic for a seed at {where}")
+        if ra[0] + ra[1] > playouts:
+            errors.append(f"playout_wins {ra} exceeds n={playouts} at {where}")
+        # 勝ち + 引き分け半分のスコアで比べる
+        sa = (ra[0] + 0.5 * ra[1]) / playouts
+        sb = (rb[0] + 0.5 * rb[1]) / playouts
+        if abs(sa - sb) > tolerance:
+            errors.append(f"playout score {sa:.3f} vs {sb:.3f} (> {tolerance:.3f}) at {where}")
+    return errors
+
+
+def check_snapshot(rs, py, positions: List[Position]) -> List[str]:
+    errors = []
+    for module in (rs, py):
+        name = module.__name__
+        seen: Dict[object, int] = {}
+        for i, (black, white, _) in enumerate(positions):
+            snap = module.BitboardOthello.from_bits(black, white).snapshot()
+            again = module.BoardSnapshot(black, white)
+            if snap != again or hash(snap) != hash(again):
+                errors.append(f"{name}: equal snapshots differ in == or hash at {black:#x} {white:#x}")
+            if snap == (black, white):
+                errors.append(f"{name}: snapshot equals a plain (black, white) tuple")
+            if (snap.black, snap.white) != (black, white) or snap.count_stones() != (bin(black).count("1"), bin(white).count("1")):
+                errors.append(f"{name}: snapshot contents differ at {black:#x} {white:#x}")
+            to_board = snap.to_board()
+            if (to_board.black, to_board.white) != (black, white):
+                errors.append(f"{name}: to_board() differs at {black:#x} {white:#x}")
+            seen.setdefault(snap, i)
+            if seen[again] != seen[snap]:
+                errors.append(f"{name}: snapshot does not work as a dict key at {black:#x} {white:#x}")
+        unique = {(black, white) for black, white, _ in positions}
+        if len(seen) != len(unique):
+            errors.append(f"{name}: {len(seen)} distinct snapshots for {len(unique)} distinct boards")
+    return errors
+
+
+def check_color(rs, py) -> List[str]:
+    errors = []
+    for module in (rs, py):
+        name = module.__name__
+        black, white = module.Color.BLACK, module.Color.WHITE
+        try:
+            table = {black: "B", white: "W"}
+        except TypeError as e:
+            errors.append(f"{name}: Color is not hashable ({e})")
+            continue
+        if hash(black) != hash(module.Color.BLACK) or table[module.Color.BLACK] != "B":
+            errors.append(f"{name}: Color hash is not stable")
+        if black == white or len({black, white, module.Color.BLACK}) != 2:
+            errors.append(f"{name}: Color.BLACK and Color.WHITE are not distinct keys")
+        if black.other != white or white.other != black:
+            errors.append(f"{name}: Color.other is wrong")
+    return errors
+
+
+def run(rs, py, positions: int = 100, depth: int = 4, threads: int = 1,
+        playouts: int = 2000, playout_positions: int = 10, seed: int = 0) -> Dict[str, List[str]]:
+    """全部の項目を調べ、{項目名: 食い違いの説明のリスト} を返す"""
+    sample = random_positions(py, positions, seed)
+    return {
+        "board": check_board(rs, py, sample),
+        "search": check_search(rs, py, sample, depth, threads),
+        "playout": check_playout(rs, py, sample[:playout_positions], playouts, seed),
+        "snapshot": check_snapshot(rs, py, sample),
+        "color": check_color(rs, py),
+    }
@@ -0,0 +1,474 @@
+"""othello_rust と同じインターフェースを持つ純 Python 実装
+
+Rust 拡張がビルドされていない環境 (CI やノートブックなど) 向けのフォールバック。
+通常は modules.backend 経由で使う。
+
+座標系は Rust 実装と同じで、LSB (2^0) が (0, 0) 左上、MSB (2^63) が (7, 7) 右下。
+1 手ごとのループを減らすため、以下を import 時に作っておく。
+- 各マスから 8 方向へ伸びる半直線のビット列 (着手時の反転計算用)
+- ビット -> 座標の変換表 (合法手の列挙用)
+
+スレッド安全性: BitboardOthello を複数のスレッドで共有してよいのは読むだけの場合に限る。
+Rust 実装と違って同時に変更してもエラーにならず、黒と白のビットが食い違った盤面になりうる。
+スレッドごとに copy() するか、他のスレッドには snapshot() を渡すこと。
+playout / playout_wins / search は呼び出した時点の盤面をコピーしてから動くので、
+実行中に別のスレッドが元の盤面を変更しても結果は変わらない (Rust 実装と同じ)。
+"""
+import operator
+import random
+import time
+from enum import Enum
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+FULL = 0xFFFFFFFFFFFFFFFF
+MASK_NOT_A = 0xFEFEFEFEFEFEFEFE  # 左端列(A列)以外
+MASK_NOT_H = 0x7F7F7F7F7F7F7F7F  # 右端列(H列)以外
+
+
+class Color(Enum):
+    BLACK = 0
+    WHITE = 1
+
+    @property
+    def other(self) -> "Color":
+        return _OTHER[self]
+
+    def __repr__(self) -> str:
+        return f"Color.{self.name}"
+
+
+_OTHER = {Color.BLACK: Color.WHITE, Color.WHITE: Color.BLACK}
+
+# 8方向の (dx, dy)
+_DIRECTIONS = [(1, 0), (-1, 0), (0, 1), (0, -1), (-1, 1), (1, -1), (1, 1), (-1, -1)]
+
+
+def _build_rays() -> List[Tuple[Tuple[int, ...], ...]]:
+    """各マスから各方向へ、盤端までのビットを並べた表を作る
+
+    反転が起きるには相手の石と自分の石が最低 1 つずつ必要なので、長さ 2 未満の半直線は除く。
+    """
+    rays = []
+    for sq in range(64):
+        x0, y0 = sq % 8, sq // 8
+        square_rays = []
+        for dx, dy in _DIRECTIONS:
+            ray = []
+            x, y = x0 + dx, y0 + dy
+            while 0 <= x < 8 and 0 <= y < 8:
+                ray.append(1 << (y * 8 + x))
+                x, y = x + dx, y + dy
+            if len(ray) >= 2:
+                square_rays.append(tuple(ray))
+        rays.append(tuple(square_rays))
+    return rays
+
+
+RAYS = _build_rays()
+# 1ビットだけ立った値 -> 座標
+BIT_TO_COORD: Dict[int, Tuple[int, int]] = {1 << i: (i % 8, i // 8) for i in range(64)}
+
+
+def _flips(sq: int, me: int, opp: int) -> int:
+    """sq に打ったときに反転する石のビット"""
+    rev = 0
+    for ray in RAYS[sq]:
+        line = 0
+        for bit in ray:
+            if opp & bit:
+                line |= bit
+            else:
+                if me & bit:
+                    rev |= line
+                break
+    return rev
+
+
+# 探索の評価関数の既定値 (Rust 実装と同じ)
+EVAL_SQUARE_WEIGHTS = [
+    100, -20, 10, 5, 5, 10, -20, 100,
+    -20, -50, -2, -2, -2, -2, -50, -20,
+    10, -2, -1, -1, -1, -1, -2, 10,
+    5, -2, -1, -1, -1, -1, -2, 5,
+    5, -2, -1, -1, -1, -1, -2, 5,
+    10, -2, -1, -1, -1, -1, -2, 10,
+    -20, -50, -2, -2, -2, -2, -50, -20,
+    100, -20, 10, 5, 5, 10, -20, 100,
+]
+EVAL_MOBILITY_WEIGHT = 5
+# (隅, X マス, C マス) のビット
+CORNER_REGIONS = [
+    (1 << 0, 1 << 9, (1 << 1) | (1 << 8)),
+    (1 << 7, 1 << 14, (1 << 6) | (1 << 15)),
+    (1 << 56, 1 << 49, (1 << 57) | (1 << 48)),
+    (1 << 63, 1 << 54, (1 << 62) | (1 << 55)),
+]
+_WIN = 100_000
+_INF = 1_000_000
+
+
+class SearchResult(NamedTuple):
+    """探索結果"""
+
+    best_move: Optional[Tuple[int, int]]
+    score: int
+    depth: int
+    nodes: int
+    elapsed: float
+    depth_times: List[float]
+
+
+class BoardSnapshot:
+    """盤面の不変スナップショット (辞書のキーにも使える)
+
+    Rust 版と同じく、同じ型の BoardSnapshot とだけ等しくなる ((black, white) のタプルとは別物)。
+    """
+
+    __slots__ = ("black", "white")
+
+    def __init__(self, black: int, white: int) -> None:
+        object.__setattr__(self, "black", black)
+        object.__setattr__(self, "white", white)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"BoardSnapshot is immutable (cannot set {name!r})")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"BoardSnapshot is immutable (cannot delete {name!r})")
+
+    def __eq__(self, other):
+        if type(other) is not BoardSnapshot:
+            return NotImplemented
+        return self.black == other.black and self.white == other.white
+
+    def __hash__(self) -> int:
+        return hash((BoardSnapshot, self.black, self.white))
+
+    def __reduce__(self):
+        return BoardSnapshot, (self.black, self.white)
+
+    def __repr__(self) -> str:
+        return f"BoardSnapshot(black=0x{self.black:016x}, white=0x{self.white:016x})"
+
+    def count_stones(self) -> Tuple[int, int]:
+        return bin(self.black).count("1"), bin(self.white).count("1")
+
+    def to_board(self) -> "BitboardOthello":
+        """同じ盤面の (変更可能な) BitboardOthello を作る"""
+        return BitboardOthello.from_bits(self.black, self.white)
+
+
+class PlayoutPolicy:
+    """プレイアウトで手を選ぶときのマスごとの重み"""
+
+    __slots__ = ("weights",)
+
+    def __init__(self, weights: Sequence[int]) -> None:
+        # Rust 版 (Vec<u32>) と同じく、整数以外は TypeError、u32 に収まらない値は OverflowError
+        values = []
+        for w in weights:
+            w = operator.index(w)
+            if not 0 <= w <= 0xFFFFFFFF:
+                raise OverflowError(f"playout weight out of range: {w}")
+            values.append(w)
+        if len(values) != 64:
+            raise ValueError("weights must have 64 entries")
+        self.weights = values
+
+    def choose(self, legal: int, rng: random.Random) -> int:
+        """合法手の中から重みに比例した確率で 1 手選び、そのマス番号を返す"""
+        squares = []
+        cumulative = []
+        total = 0
+        while legal:
+            low = legal & -legal
+            sq = low.bit_length() - 1
+            total += self.weights[sq]
+            squares.append(sq)
+            cumulative.append(total)
+            legal ^= low
+        # 重みが全部 0 なら一様に選ぶ
+        if total == 0:
+            return rng.choice(squares)
+        r = rng.randrange(total)
+        for sq, c in zip(squares, cumulative):
+            if r < c:
+                return sq
+        return squares[-1]
+
+
+class BitboardOthello:
+    __slots__ = ("black", "white")
+
+    def __init__(self) -> None:
+        self.white = 0x0000001008000000
+        self.black = 0x0000000810000000
+
+    @staticmethod
+    def from_bits(black: int, white: int) -> "BitboardOthello":
+        """ビットボードから盤面を作る"""
+        board = BitboardOthello.__new__(BitboardOthello)
+        board.black = black
+        board.white = white
+        return board
+
+    def make_move(self, x: int, y: int, color: Color) -> bool:
+        if not (0 <= x < 8 and 0 <= y < 8):
+            return False
+        sq = y * 8 + x
+        pos = 1 << sq
+        if (self.black | self.white) & pos:
+            return False
+
+        if color == Color.BLACK:
+            me, opp = self.black, self.white
+        else:
+            me, opp = self.white, self.black
+
+        rev = _flips(sq, me, opp)
+        if rev == 0:
+            return False
+
+        if color == Color.BLACK:
+            self.black = me | pos | rev
+            self.white = opp & ~rev
+        else:
+            self.white = me | pos | rev
+            self.black = opp & ~rev
+        return True
+
+    def count_stones(self) -> Tuple[int, int]:
+        return bin(self.black).count("1"), bin(self.white).count("1")
+
+    def get_legal_moves_bits(self, color: Color) -> int:
+        if color == Color.BLACK:
+            me, opp = self.black, self.white
+        else:
+            me, opp = self.white, self.black
+        blank = ~(me | opp) & FULL
+
+        # 左右に回り込む方向は端の列を除いた相手の石だけを辿る
+        o = opp & 0x7E7E7E7E7E7E7E7E
+        legal = 0
+
+        # 右 (+1) / 左 (-1)
+        t = o & (me << 1); t |= o & (t << 1); t |= o & (t << 1)
+        t |= o & (t << 1); t |= o & (t << 1); t |= o & (t << 1)
+        legal |= t << 1
+        t = o & (me >> 1); t |= o & (t >> 1); t |= o & (t >> 1)
+        t |= o & (t >> 1); t |= o & (t >> 1); t |= o & (t >> 1)
+        legal |= t >> 1
+
+        # 下 (+8) / 上 (-8)
+        t = opp & (me << 8); t |= opp & (t << 8); t |= opp & (t << 8)
+        t |= opp & (t << 8); t |= opp & (t << 8); t |= opp & (t << 8)
+        legal |= t << 8
+        t = opp & (me >> 8); t |= opp & (t >> 8); t |= opp & (t >> 8)
+        t |= opp & (t >> 8); t |= opp & (t >> 8); t |= opp & (t >> 8)
+        legal |= t >> 8
+
+        # 左下 (+7) / 右上 (-7)
+        t = o & (me << 7); t |= o & (t << 7); t |= o & (t << 7)
+        t |= o & (t << 7); t |= o & (t << 7); t |= o & (t << 7)
+        legal |= t << 7
+        t = o & (me >> 7); t |= o & (t >> 7); t |= o & (t >> 7)
+        t |= o & (t >> 7); t |= o & (t >> 7); t |= o & (t >> 7)
+        legal |= t >> 7
+
+        # 右下 (+9) / 左上 (-9)
+        t = o & (me << 9); t |= o & (t << 9); t |= o & (t << 9)
+        t |= o & (t << 9); t |= o & (t << 9); t |= o & (t << 9)
+        legal |= t << 9
+        t = o & (me >> 9); t |= o & (t >> 9); t |= o & (t >> 9)
+        t |= o & (t >> 9); t |= o & (t >> 9); t |= o & (t >> 9)
+        legal |= t >> 9
+
+        return legal & blank
+
+    def get_legal_moves(self, color: Color) -> List[Tuple[int, int]]:
+        bits = self.get_legal_moves_bits(color)
+        moves = []
+        while bits:
+            low = bits & -bits
+            moves.append(BIT_TO_COORD[low])
+            bits ^= low
+        return moves
+
+    def playout(self, color: Color, policy: Optional[PlayoutPolicy] = None, seed: int = 0) -> Tuple[int, int]:
+        """color の手番から終局までプレイアウトし、終局時の (黒石数, 白石数) を返す"""
+        return self._playout(color, policy, random.Random(seed))
+
+    def playout_wins(self, color: Color, to_move: Color, n: int,
+                     policy: Optional[PlayoutPolicy] = None, seed: int = 0) -> Tuple[int, int]:
+        """to_move の手番から n 回プレイアウトし、color 側の (勝ち数, 引き分け数) を返す"""
+        rng = random.Random(seed)
+        wins = draws = 0
+        for _ in range(n):
+            black, white = self._playout(to_move, policy, rng)
+            me, opp = (black, white) if color == Color.BLACK else (white, black)
+            if me > opp:
+                wins += 1
+            elif me == opp:
+                draws += 1
+        return wins, draws
+
+    def _playout(self, color: Color, policy: Optional[PlayoutPolicy], rng: random.Random) -> Tuple[int, int]:
+        board = self.copy()
+        pass_count = 0
+        while pass_count < 2:
+            legal = board.get_legal_moves_bits(color)
+            if legal:
+                if policy is not None:
+                    sq = policy.choose(legal, rng)
+                else:
+                    squares = []
+                    while legal:
+                        low = legal & -legal
+                        squares.append(low.bit_length() - 1)
+                        legal ^= low
+                    sq = rng.choice(squares)
+                if color == Color.BLACK:
+                    rev = _flips(sq, board.black, board.white)
+                    board.black |= (1 << sq) | rev
+                    board.white &= ~rev
+                else:
+                    rev = _flips(sq, board.white, board.black)
+                    board.white |= (1 << sq) | rev
+                    board.black &= ~rev
+                pass_count = 0
+            else:
+                pass_count += 1
+            color = _OTHER[color]
+        return board.count_stones()
+
+    def search(self, color: Color, depth: int, threads: int = 1, hash_mb: int = 16,
+               weights: Optional[Sequence[int]] = None,
+               mobility: int = EVAL_MOBILITY_WEIGHT,
+               pattern: Optional[Sequence[int]] = None) -> SearchResult:
+        """color の手番で alpha-beta 探索し、最善手を返す
+
+        pattern は隅が空いているときの [X 打ち, C 打ち] の石 1 つあたりの評価値。
+
+        Rust 実装と同じ評価値を返すが、GIL があるので threads と hash_mb は無視して
+        1 スレッド・置換表なしで探索する。
+        """
+        if weights is None:
+            weights = EVAL_SQUARE_WEIGHTS
+        elif len(weights) != 64:
+            raise ValueError("weights must have 64 entries")
+        if pattern is None:
+            pattern = (0, 0)
+        elif len(pattern) != 2:
+            raise ValueError("pattern must have 2 entries")
+        me, opp = (self.black, self.white) if color == Color.BLACK else (self.white, self.black)
+        search = _Search(list(weights), mobility, tuple(pattern))
+        start = time.perf_counter()
+        best: Optional[Tuple[int, int]] = None
+        completed = 0
+        depth_times = []
+        for d in range(1, max(1, min(depth, 60)) + 1):
+            result = search.root(me, opp, d)
+            if result is None:
+                break
+            best = result
+            completed = d
+            depth_times.append(time.perf_counter() - start)
+        return SearchResult(
+            BIT_TO_COORD[1 << best[1]] if best else None,
+            best[0] if best else 0,
+            completed,
+            search.nodes,
+            time.perf_counter() - start,
+            depth_times,
+        )
+
+    def snapshot(self) -> BoardSnapshot:
+        """現在の盤面の不変スナップショットを返す"""
+        return BoardSnapshot(self.black, self.white)
+
+    def copy(self) -> "BitboardOthello":
+        return BitboardOthello.from_bits(self.black, self.white)
+
+    def __copy__(self) -> "BitboardOthello":
+        return self.copy()
+
+
+def _legal_bits(me: int, opp: int) -> int:
+    return BitboardOthello.from_bits(me, opp).get_legal_moves_bits(Color.BLACK)
+
+
+class _Search:
+    """BitboardOthello.search の中身 (negamax + alpha-beta)"""
+
+    def __init__(self, weights: List[int], mobility: int, corner: Tuple[int, int] = (0, 0)) -> None:
+        self.weights = weights
+        self.mobility = mobility
+        self.corner = corner
+        self.nodes = 0
+        # 同じ評価値の手はマス番号の小さい順に並べる (Rust 実装と同じ順番)
+        self.order = sorted(range(64), key=lambda sq: (-weights[sq], sq))
+
+    def evaluate(self, me: int, opp: int) -> int:
+        score = 0
+        w = self.weights
+        while me:
+            low = me & -me
+            score += w[low.bit_length() - 1]
+            me ^= low
+        while opp:
+            low = opp & -opp
+            score -= w[low.bit_length() - 1]
+            opp ^= low
+        return score
+
+    def eval_position(self, me: int, opp: int) -> int:
+        score = self.evaluate(me, opp)
+        if self.mobility:
+            diff = bin(_legal_bits(me, opp)).count("1") - bin(_legal_bits(opp, me)).count("1")
+            score += self.mobility * diff
+        if self.corner != (0, 0):
+            empty = ~(me | opp)
+            wx, wc = self.corner
+            for corner, x, c in CORNER_REGIONS:
+                if empty & corner:
+                    score += wx * (bin(me & x).count("1") - bin(opp & x).count("1"))
+                    score += wc * (bin(me & c).count("1") - bin(opp & c).count("1"))
+        return score
+
+    def moves(self, legal: int) -> List[int]:
+        return [sq for sq in self.order if legal >> sq & 1]
+
+    def negamax(self, me: int, opp: int, depth: int, alpha: int, beta: int) -> int:
+        self.nodes += 1
+        legal = _legal_bits(me, opp)
+        if not legal:
+            if not _legal_bits(opp, me):
+                diff = bin(me).count("1") - bin(opp).count("1")
+                return _WIN + diff if diff > 0 else -_WIN + diff if diff < 0 else 0
+            return -self.negamax(opp, me, depth, -beta, -alpha)
+        if depth == 0:
+            return self.eval_position(me, opp)
+
+        best = -_INF
+        for sq in self.moves(legal):
+            rev = _flips(sq, me, opp)
+            score = -self.negamax(opp & ~rev, me | (1 << sq) | rev, depth - 1, -beta, -alpha)
+            if score > best:
+                best = score
+            if score > alpha:
+                alpha = score
+                if alpha >= beta:
+                    break
+        return best
+
+    def root(self, me: int, opp: int, depth: int) -> Optional[Tuple[int, int]]:
+        """(評価値, 最善手のマス番号) を返す。打てる手が無ければ None"""
+        legal = _legal_bits(me, opp)
+        alpha = -_INF
+        best_sq = None
+        for sq in self.moves(legal):
+            rev = _flips(sq, me, opp)
+            score = -self.negamax(opp & ~rev, me | (1 << sq) | rev, depth - 1, -_INF, -alpha)
+            if best_sq is None or score > alpha:
+                alpha, best_sq = score, sq
+        return None if best_sq is None else (alpha, best_sq)
@@ -0,0 +1,86 @@
+"""AI プレイヤーのレジストリ
+
+名前から "モジュール:クラス名" の参照だけを持ち、選ばれたときに初めて import する。
+外部パッケージの AI は entry point グループ "othello.ai" で追加できる。
+
+    [project.entry-points."othello.ai"]
+    myai = "mypackage.ai:MyAI"
+"""
+import importlib
+from typing import Dict, List, Optional
+
+ENTRY_POINT_GROUP = "othello.ai"
+
+# 組み込みの AI (名前 -> 参照)
+_BUILTIN: Dict[str, str] = {
+    "random": "modules.ai:RandomAI",
+    "yosumi": "modules.ai:YosumiAI",
+    "montecarlo": "modules.ai:MonteCarloAI",
+    "montecarlo-uniform": "modules.ai:UniformMonteCarloAI",
+    "montecarlo-heavy": "modules.ai:HeavyMonteCarloAI",
+    "alphabeta": "modules.ai:AlphaBetaAI",
+    "alphabeta-smp": "modules.ai:SMPAlphaBetaAI",
+}
+
+# GUI などで表示する名前
+LABELS: Dict[str, str] = {
+    "random": "Random AI",
+    "yosumi": "Yosumi",
+    "montecarlo": "Monte Carlo AI",
+    "montecarlo-uniform": "Monte Carlo AI (native)",
+    "montecarlo-heavy": "Monte Carlo AI (heavy)",
+    "alphabeta": "Alpha-Beta AI",
+    "alphabeta-smp": "Alpha-Beta AI (Lazy SMP)",
+}
+
+_registered: Dict[str, str] = dict(_BUILTIN)
+_resolved: Dict[str, type] = {}
+_entry_points: Optional[Dict[str, str]] = None
+
+
+def register(name: str, target: str) -> None:
+    """AI を "モジュール:クラス名" で登録する"""
+    _registered[name] = target
+    _resolved.pop(name, None)
+
+
+def _load_entry_points() -> Dict[str, str]:
+    """entry point は一覧や未知の名前が必要になったときだけ読む"""
+    global _entry_points
+    if _entry_points is None:
+        from importlib.metadata import entry_points
+
+        eps = entry_points()
+        if hasattr(eps, "select"):
+            selected = eps.select(group=ENTRY_POINT_GROUP)
+        else:  # Python 3.8 / 3.9
+            selected = eps.get(ENTRY_POINT_GROUP, [])
+        _entry_points = {ep.name: ep.value for ep in selected}
+    return _entry_points
+
+
+def available() -> List[str]:
+    """登録されている AI の名前一覧 (組み込みが先)"""
+    names = list(_registered)
+    names += [name for name in _load_entry_points() if name not in _registered]
+    return names
+
+
+def label(name: str) -> str:
+    return LABELS.get(name, name)
+
+
+def resolve(name: str) -> type:
+    """名前から AI クラスを import して返す"""
+    cls = _resolved.get(name)
+    if cls is not None:
+        return cls
+
+    target = _registered.get(name) or _load_entry_points().get(name)
+    if target is None:
+        raise ValueError(f"unknown AI: {name} (available: {', '.join(available())})")
+
+    module_name, _, attr = target.partition(":")
+    cls = getattr(importlib.import_module(module_name), attr)
+    _resolved[name] = cls
+    return cls
@@ -0,0 +1,258 @@
+"""複数の対局を並行して進め、観戦用に盤面を配信する (modules/ai_gui.py の観戦モード用)
+
+対局はプロセスプールで進めるので、Python スレッドの GIL に縛られずに全コアを使える。
+ワーカーは待たずに最後まで打ち、1 手ごとの盤面をキューに送る。GUI 側の受信スレッドが
+盤面ごとに溜めておき、GUI は 1 フレームに 1 回 poll() して、前のフレーム以降に
+表示すべき盤面と終わった対局をまとめて受け取る。
+
+1 手ごとの待ち時間 (delay) は poll() が盤面を出す間隔で作る。ワーカーは眠らないので、
+盤面の数がワーカー数より多くても全部の盤面に対局が入る。
+
+このモジュールは Qt に依存しない。
+"""
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional, Tuple, Union
+
+from modules import registry
+from modules.backend import BitboardOthello
+from modules.distributed import Job, make_job, winner_code
+from modules.game import Game
+from modules.state import GameFeed
+
+
+@dataclass(frozen=True)
+class BoardUpdate:
+    slot: int
+    job: Job
+    black: int
+    white: int
+    last_move: Optional[Tuple[int, int]]
+    finished: bool = False
+
+
+@dataclass(frozen=True)
+class GameResult:
+    slot: int
+    job: Job
+    winner: str  # winner_code() の "B" / "W" / "D"
+    black_count: int
+    white_count: int
+
+
+# --- ワーカー側 ------------------------------------------------------------
+
+_queue = None
+_cancel = None
+
+
+class _Cancelled(Exception):
+    pass
+
+
+def _init_worker(queue, cancel) -> None:
+    global _queue, _cancel
+    _queue, _cancel = queue, cancel
+
+
+class _QueueFeed(GameFeed):
+    """公開した盤面をキューにも送る GameFeed
+
+    送るのは前回から min_interval 秒以上たったときと終局時だけなので、
+    速い AI 同士でも 1 局あたりの送信回数は GUI のフレーム数程度に収まる。
+    min_interval が 0 なら全部の手を送る。
+    """
+
+    def __init__(self, board: BitboardOthello, slot: int, job: Job, min_interval: float) -> None:
+        super().__init__(board)
+        self.slot, self.job = slot, job
+        self.min_interval = min_interval
+        self.last_sent = 0.0
+
+    def publish(self, board, turn, last_move=None):
+        state = super().publish(board, turn, last_move)
+        if _cancel.is_set():
+            raise _Cancelled
+        now = time.monotonic()
+        if turn is None or now - self.last_sent >= self.min_interval:
+            self.last_sent = now
+            snapshot = state.board
+            _queue.put(("ply", self.slot, self.job.to_wire(), snapshot.black, snapshot.white, last_move, turn is None))
+        return state
+
+
+def play_watched(slot: int, wire: list, min_interval: float) -> None:
+    """1 局打ち、途中の盤面と結果をキューに送る"""
+    import random
+
+    job = Job(*wire)
+    random.seed(job.seed)
+    game = Game(registry.resolve(job.black), registry.resolve(job.white))
+    game.feed = _QueueFeed(game.othello, slot, job, min_interval)
+    try:
+        winner = game.play()
+    except _Cancelled:
+        return
+    black_count, white_count = game.othello.count_stones()
+    _queue.put(("done", slot, wire, winner_code(winner), black_count, white_count))
+
+
+# --- GUI 側 ----------------------------------------------------------------
+
+class Spectator:
+    """boards 個の対局を常に進め、終わった盤面には次の対局を入れる
+
+    ai_a と ai_b は 1 局ごとに先後を入れ替え、2 局ずつ同じシードで打つ。
+    delay > 0 なら各盤面の手を delay 秒に 1 手ずつ見せる。盤面の次の対局は、
+    前の対局を最後まで見せてから始めるので、溜まる盤面は 1 盤面あたり 1 局分まで。
+    workers の既定は盤面の数と CPU 数の小さい方。
+    poll() は GUI スレッドから呼ぶこと。
+    """
+
+    def __init__(self, ai_a: str, ai_b: str, boards: int, workers: Optional[int] = None,
+                 delay: float = 0.0, seed: int = 0, min_interval: float = 1 / 60) -> None:
+        # 未知の AI 名は対局を始める前に弾く
+        registry.resolve(ai_a)
+        registry.resolve(ai_b)
+        self.ai_a, self.ai_b = ai_a, ai_b
+        self.boards = boards
+        self.delay = delay
+        self.seed = seed
+        self.min_interval = min_interval
+        self.next_job_id = 0
+        self.games = 0
+        self.start_time = 0.0
+
+        # Qt を読み込んだプロセスを fork しないように spawn で起動する
+        ctx = multiprocessing.get_context("spawn")
+        self._queue = ctx.Queue()
+        self._cancel = ctx.Event()
+        if workers is None:
+            workers = min(boards, os.cpu_count() or 1)
+        self._pool = ProcessPoolExecutor(
+            workers, mp_context=ctx, initializer=_init_worker, initargs=(self._queue, self._cancel)
+        )
+        self._futures: Dict[int, Future] = {}
+        self._lock = threading.Lock()
+        # 盤面ごとの、まだ見せていない手と結果 (受信順)
+        self._pending: Dict[int, Deque[Union[BoardUpdate, GameResult]]] = {
+            slot: deque() for slot in range(boards)
+        }
+        # 盤面ごとの、次の手を見せてよい時刻
+        self._due: Dict[int, float] = {slot: 0.0 for slot in range(boards)}
+        self._reader = threading.Thread(target=self._read, daemon=True)
+
+    def start(self) -> None:
+        self.start_time = time.monotonic()
+        self._reader.start()
+        for slot in range(self.boards):
+            self._submit(slot)
+
+    def stop(self) -> None:
+        """進行中の対局を打ち切る (結果は集計しない)。対局中の AI が今の 1 手を打ち終えるまで待つ"""
+        self._cancel.set()
+        # shutdown(cancel_futures=True) は Python 3.9 から。まだ始まっていない対局は自分で取り消す
+        for future in self._futures.values():
+            future.cancel()
+        # 進行中の対局は次の手で打ち切られるので、終わるのを待っても長くはかからない。
+        # 3.8 の shutdown(wait=False) は終了時にワーカーを止められず固まることがある
+        self._pool.shutdown(wait=True)
+        self._queue.put(None)
+
+    def games_per_sec(self) -> float:
+        elapsed = time.monotonic() - self.start_time
+        return self.games / elapsed if elapsed > 0 else 0.0
+
+    def _submit(self, slot: int) -> None:
+        job = make_job(self.next_job_id, self.ai_a, self.ai_b, self.seed)
+        self.next_job_id += 1
+        # 1 手ずつ見せるなら全部の手が要る
+        min_interval = 0.0 if self.delay else self.min_interval
+        self._futures[slot] = self._pool.submit(play_watched, slot, job.to_wire(), min_interval)
+
+    def _read(self) -> None:
+        """キューを読み続け、盤面ごとに届いた順に溜める"""
+        while True:
+            msg = self._queue.get()
+            if msg is None:
+                return
+            if msg[0] == "ply":
+                _, slot, wire, black, white, last_move, finished = msg
+                item = BoardUpdate(slot, Job(*wire), black, white, last_move, finished)
+            else:
+                _, slot, wire, code, black_count, white_count = msg
+                item = GameResult(slot, Job(*wire), code, black_count, white_count)
+            with self._lock:
+                self._pending[slot].append(item)
+
+    def _release(self, now: float) -> Tuple[Dict[int, BoardUpdate], List[GameResult]]:
+        """見せる時刻になった手と結果を溜めたものから取り出す (ロックを持って呼ぶ)"""
+        updates: Dict[int, BoardUpdate] = {}
+        finished: List[GameResult] = []
+        for slot, pending in self._pending.items():
+            while pending and now >= self._due[slot]:
+                item = pending.popleft()
+                if isinstance(item, GameResult):
+                    finished.append(item)
+                    continue
+                updates[slot] = item
+                if self.delay:
+                    self._due[slot] = now + self.delay
+        return updates, finished
+
+    def poll(self) -> Tuple[Dict[int, BoardUpdate], List[GameResult]]:
+        """前回の poll() 以降に見せる盤面 {slot: 最新の盤面} と、終わった対局を返す
+
+        delay > 0 なら 1 盤面あたり delay 秒に 1 手ずつ進める。
+        終わった対局の盤面には次の対局を入れる。
+        """
+        with self._lock:
+            updates, finished = self._release(time.monotonic())
+
+        # ワーカーで例外が起きた対局はここで呼び出し元に伝える
+        for future in self._futures.values():
+            if future.done() and not future.cancelled() and future.exception() is not None:
+                raise future.exception()
+
+        for result in finished:
+            self.games += 1
+            if not self._cancel.is_set():
+                self._submit(result.slot)
+        return updates, finished
+
+
+@dataclass
+class Score:
+    """ai_a 側から見た通算成績"""
+    wins: int = 0
+    draws: int = 0
+    losses: int = 0
+    black_wins: int = 0  # ai_a が黒番で勝った数
+    white_wins: int = 0  # ai_a が白番で勝った数
+
+    @property
+    def games(self) -> int:
+        return self.wins + self.draws + self.losses
+
+    @property
+    def rate(self) -> float:
+        return (self.wins + 0.5 * self.draws) / self.games if self.games else 0.0
+
+    def add(self, result: GameResult) -> None:
+        # 偶数番目のジョブは ai_a が黒
+        a_color = "B" if result.job.job_id % 2 == 0 else "W"
+        if result.winner == "D":
+            self.draws += 1
+        elif result.winner == a_color:
+            self.wins += 1
+            if a_color == "B":
+                self.black_wins += 1
+            else:
+                self.white_wins += 1
+        else:
+            self.losses += 1
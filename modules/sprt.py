@@ -0,0 +1,206 @@
+"""逐次確率比検定 (SPRT) による早期打ち切り付きの AI 対戦
+
+同じシードで先後を入れ替えた 2 局を 1 ペアとし、ペア単位のバッチで対局する。
+バッチごとに対数尤度比 (LLR) を更新し、設定した誤り率 (alpha, beta) の境界を
+越えた時点で打ち切る。
+
+- H0: 挑戦者 (candidate) の Elo 差は elo0
+- H1: 挑戦者 (candidate) の Elo 差は elo1
+
+LLR は Fishtest と同じ正規近似 (GSPRT) で計算する。pentanomial モデルはペアの
+スコア (0, 0.5, 1, 1.5, 2) の分布、trinomial モデルは 1 局ごとの勝敗分布を使う。
+"""
+import math
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from statistics import NormalDist
+from typing import Callable, List, Optional, Tuple
+
+from modules import registry
+from modules.backend import Color
+from modules.game import play_seeded
+
+MODELS = ("pentanomial", "trinomial")
+
+
+def elo_to_score(elo: float) -> float:
+    return 1.0 / (1.0 + 10.0 ** (-elo / 400.0))
+
+
+def score_to_elo(score: float) -> float:
+    score = min(max(score, 1e-6), 1.0 - 1e-6)
+    return -400.0 * math.log10(1.0 / score - 1.0)
+
+
+def play_pair(baseline: str, candidate: str, seed: int) -> Tuple[float, float]:
+    """同じシードで先後を入れ替えて 2 局打ち、挑戦者側のスコアを返す"""
+    baseline_ai = registry.resolve(baseline)
+    candidate_ai = registry.resolve(candidate)
+    first, _, _ = play_seeded(candidate_ai, baseline_ai, seed)
+    second, _, _ = play_seeded(baseline_ai, candidate_ai, seed)
+    return _score(first, Color.BLACK), _score(second, Color.WHITE)
+
+
+def _score(winner: Optional[Color], color: Color) -> float:
+    if winner is None:
+        return 0.5
+    return 1.0 if winner == color else 0.0
+
+
+@dataclass
+class SPRTResult:
+    elo0: float
+    elo1: float
+    alpha: float
+    beta: float
+    model: str = "pentanomial"
+    pentanomial: List[int] = field(default_factory=lambda: [0] * 5)  # ペアのスコア 0, 0.5, ..., 2 の回数
+    wdl: List[int] = field(default_factory=lambda: [0] * 3)  # 挑戦者の勝ち・引き分け・負け
+    max_games: int = 0
+
+    @property
+    def pairs(self) -> int:
+        return sum(self.pentanomial)
+
+    @property
+    def games(self) -> int:
+        return 2 * self.pairs
+
+    @property
+    def bounds(self) -> Tuple[float, float]:
+        return math.log(self.beta / (1 - self.alpha)), math.log((1 - self.beta) / self.alpha)
+
+    def add_pair(self, first: float, second: float) -> None:
+        self.pentanomial[int(round((first + second) * 2))] += 1
+        for s in (first, second):
+            self.wdl[0 if s == 1.0 else 1 if s == 0.5 else 2] += 1
+
+    def _samples(self) -> Tuple[int, List[Tuple[float, int]]]:
+        """(標本数, [(スコア, 回数), ...]) をモデルに応じて返す (スコアは 0-1 に正規化)"""
+        if self.model == "pentanomial":
+            return self.pairs, [(i / 4, n) for i, n in enumerate(self.pentanomial)]
+        return self.games, [(1.0, self.wdl[0]), (0.5, self.wdl[1]), (0.0, self.wdl[2])]
+
+    def mean_var(self) -> Tuple[int, float, float]:
+        """標本数・平均スコア・1 標本あたりの分散
+
+        出現していないスコアにも小さな回数を足して、分散が 0 にならないようにする
+        (同じ AI 同士をシード固定で打つとペアのスコアが常に 1 になるため)。
+        """
+        n, samples = self._samples()
+        if n == 0:
+            return 0, 0.5, 0.0
+        samples = [(x, c + 1e-3) for x, c in samples]
+        total = sum(c for _, c in samples)
+        mean = sum(x * c for x, c in samples) / total
+        var = sum(c * (x - mean) ** 2 for x, c in samples) / total
+        return n, mean, var
+
+    @property
+    def llr(self) -> float:
+        n, mean, var = self.mean_var()
+        if n == 0 or var <= 0:
+            return 0.0
+        s0, s1 = elo_to_score(self.elo0), elo_to_score(self.elo1)
+        return n * (s1 - s0) * (2 * mean - s0 - s1) / (2 * var)
+
+    @property
+    def status(self) -> str:
+        lower, upper = self.bounds
+        llr = self.llr
+        if llr >= upper:
+            return "H1"
+        if llr <= lower:
+            return "H0"
+        if self.max_games and self.games >= self.max_games:
+            return "inconclusive"
+        return "running"
+
+    def elo(self, confidence: float = 0.95) -> Tuple[float, float, float]:
+        """Elo 差の推定値と信頼区間 (下限, 上限)"""
+        n, mean, var = self.mean_var()
+        if n == 0:
+            return 0.0, -math.inf, math.inf
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        margin = z * math.sqrt(var / n)
+        return score_to_elo(mean), score_to_elo(mean - margin), score_to_elo(mean + margin)
+
+    def fixed_games(self) -> int:
+        """同じ誤り率で elo0 と elo1 を見分けるのに固定長の試験で必要な対局数"""
+        n, _, var = self.mean_var()
+        if n == 0 or var <= 0:
+            return 0
+        s0, s1 = elo_to_score(self.elo0), elo_to_score(self.elo1)
+        z = NormalDist().inv_cdf(1 - self.alpha) + NormalDist().inv_cdf(1 - self.beta)
+        samples = math.ceil((z * math.sqrt(var) / (s1 - s0)) ** 2)
+        return 2 * samples if self.model == "pentanomial" else samples
+
+
+def run_sprt(
+    baseline: str,
+    candidate: str,
+    elo0: float = 0.0,
+    elo1: float = 20.0,
+    alpha: float = 0.05,
+    beta: float = 0.05,
+    model: str = "pentanomial",
+    batch_pairs: int = 8,
+    max_games: int = 20000,
+    seed: int = 0,
+    workers: Optional[int] = 1,
+    callback: Optional[Callable[[SPRTResult], None]] = None,
+) -> SPRTResult:
+    """H0/H1 のどちらかが採択されるか max_games に達するまで対局する
+
+    workers が 1 ならこのプロセスで、それ以外はプロセスプールでバッチを並列に打つ。
+    """
+    if model not in MODELS:
+        raise ValueError(f"unknown model: {model}")
+    # 未知の AI 名は対局を始める前に弾く
+    registry.resolve(baseline)
+    registry.resolve(candidate)
+
+    result = SPRTResult(elo0, elo1, alpha, beta, model, max_games=max_games)
+    pool = ProcessPoolExecutor(workers) if workers != 1 else None
+    try:
+        next_seed = seed
+        while result.status == "running":
+            seeds = range(next_seed, next_seed + batch_pairs)
+            next_seed += batch_pairs
+            if pool is None:
+                pairs = [play_pair(baseline, candidate, s) for s in seeds]
+            else:
+                pairs = list(pool.map(play_pair, [baseline] * batch_pairs, [candidate] * batch_pairs, seeds))
+            for first, second in pairs:
+                result.add_pair(first, second)
+            if callback is not None:
+                callback(result)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return result
+
+
+def format_result(result: SPRTResult, baseline: str, candidate: str) -> str:
+    lower, upper = result.bounds
+    elo, elo_low, elo_high = result.elo()
+    fixed = result.fixed_games()
+    verdict = {
+        "H1": f"H1 を採択 ({candidate} は {baseline} より強い: elo >= {result.elo1})",
+        "H0": f"H0 を採択 ({candidate} は強くない: elo <= {result.elo0})",
+        "inconclusive": "判定できず (max_games に到達)",
+        "running": "実行中",
+    }[result.status]
+    lines = [
+        "-" * 40,
+        f"SPRT ({result.model}): {candidate} vs {baseline}",
+        f"  結果       : {verdict}",
+        f"  LLR        : {result.llr:.3f}  [{lower:.3f}, {upper:.3f}]",
+        f"  対局数     : {result.games}  (勝 {result.wdl[0]} / 分 {result.wdl[1]} / 負 {result.wdl[2]})",
+        f"  ペア分布   : {result.pentanomial}",
+        f"  Elo 差     : {elo:+.1f}  (95% CI: {elo_low:+.1f} .. {elo_high:+.1f})",
+    ]
+    if fixed:
+        lines.append(f"  固定長なら : {fixed} 局  (節約 {fixed - result.games:+d} 局)")
+    lines.append("-" * 40)
+    return "\n".join(lines)
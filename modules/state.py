@@ -0,0 +1,39 @@
+"""スレッド間で共有する対局状態
+
+対局を進めるスレッドが 1 手ごとに新しい GameState (不変) を作って差し替え、
+GUI など他のスレッドは GameFeed.latest で最新の状態を読む。
+GameState は作成後に変更されず、差し替えは属性への代入 1 回なので、
+読む側はロック無しでも書きかけの盤面を見ることはない。
+"""
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from modules.backend import Color, BitboardOthello, BoardSnapshot
+
+
+@dataclass(frozen=True)
+class GameState:
+    version: int  # 公開するたびに 1 増える
+    board: BoardSnapshot
+    turn: Optional[Color]  # 次の手番 (終局なら None)
+    last_move: Optional[Tuple[int, int]] = None
+
+    def count_stones(self) -> Tuple[int, int]:
+        return self.board.count_stones()
+
+
+class GameFeed:
+    """最新の GameState を公開する。書き込むのは対局を進める 1 スレッドだけにすること"""
+
+    def __init__(self, board: BitboardOthello, turn: Optional[Color] = Color.BLACK) -> None:
+        self._state = GameState(0, board.snapshot(), turn)
+
+    @property
+    def latest(self) -> GameState:
+        return self._state
+
+    def publish(self, board: BitboardOthello, turn: Optional[Color],
+                last_move: Optional[Tuple[int, int]] = None) -> GameState:
+        state = GameState(self._state.version + 1, board.snapshot(), turn, last_move)
+        self._state = state
+        return state
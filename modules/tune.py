@@ -0,0 +1,355 @@
+"""自己対局の局面から評価関数の重みを調整する (Texel 法)
+
+    othello tune generate positions.bin --games 20000 --ai alphabeta --workers 8
+    othello tune convert games.txt positions.bin     # 既存の棋譜 (1 行 1 局) から作る場合
+    othello tune fit positions.bin --out eval.json --epochs 3 --workers 8
+
+書き出した eval.json は AlphaBetaAI(weights="eval.json") や、WEIGHTS を設定した
+AlphaBetaAI のサブクラスで読み込める (modules/weights.py の "eval", "mobility", "pattern")。
+
+局面ファイルは POSITION_DTYPE のレコードを並べただけのバイナリで、手番側から見た
+(自分の石, 相手の石, 結果 1/0.5/0) を持つ。学習時は np.memmap で開いてバッチ単位で
+読むので、局面数が数千万でもメモリ使用量はバッチサイズ × ワーカー数で決まる。
+
+モデルはロジスティック回帰で、手番側の勝率を sigmoid(評価値 / SCALE) で予測し、
+交差エントロピーを Adam で最小化する。評価値は BitboardOthello.search と同じ形で、
+- マスの重み (8 通りの対称性で 10 種類にまとめる)
+- mobility * 着手可能数の差
+- 隅が空いているときの X マス・C マスの石 (pattern)
+の和。NumPy が必要 (pip install "othello_rust[tune]")。
+"""
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from modules import registry
+from modules.backend import Color, BitboardOthello, CORNER_REGIONS, EVAL_MOBILITY_WEIGHT, EVAL_SQUARE_WEIGHTS
+from modules.game import replay_moves
+from modules.notation import Move
+from modules.weights import load_eval_weights, save_weights
+
+POSITION_DTYPE = np.dtype([("me", "<u8"), ("opp", "<u8"), ("result", "<f4")])
+
+# 評価値 SCALE で勝率のオッズが e 倍になる
+SCALE = 100.0
+
+
+def _square_classes() -> List[int]:
+    """対称なマスに同じ番号 (0-9) を振る"""
+    keys = []
+    for sq in range(64):
+        x, y = sq % 8, sq // 8
+        x, y = min(x, 7 - x), min(y, 7 - y)
+        keys.append((min(x, y), max(x, y)))
+    order = sorted(set(keys))
+    return [order.index(k) for k in keys]
+
+
+SQUARE_CLASS = _square_classes()
+N_CLASSES = max(SQUARE_CLASS) + 1
+MOBILITY = N_CLASSES
+PATTERN_X = N_CLASSES + 1
+PATTERN_C = N_CLASSES + 2
+N_FEATURES = N_CLASSES + 3
+
+_CLASS_MATRIX = np.zeros((64, N_CLASSES), np.float32)
+_CLASS_MATRIX[np.arange(64), SQUARE_CLASS] = 1.0
+
+# (隅, X マス, [C マス]) のマス番号
+_CORNER_SQUARES = [
+    (corner.bit_length() - 1, x.bit_length() - 1, [sq for sq in range(64) if c >> sq & 1])
+    for corner, x, c in CORNER_REGIONS
+]
+
+_NOT_EDGE = np.uint64(0x7E7E7E7E7E7E7E7E)
+
+
+# --- 特徴量 -----------------------------------------------------------------
+
+def _bits(b: np.ndarray) -> np.ndarray:
+    """(N,) の uint64 を (N, 64) の 0/1 に展開する (列番号 = マス番号)"""
+    return np.unpackbits(b.astype("<u8").view(np.uint8).reshape(-1, 8), axis=1, bitorder="little")
+
+
+def _popcount(b: np.ndarray) -> np.ndarray:
+    return _bits(b).sum(axis=1, dtype=np.int32)
+
+
+def _legal(me: np.ndarray, opp: np.ndarray) -> np.ndarray:
+    """BitboardOthello.get_legal_moves_bits を配列でまとめて計算する"""
+    o = opp & _NOT_EDGE
+    legal = np.zeros_like(me)
+    for shift, mask in ((1, o), (8, opp), (7, o), (9, o)):
+        s = np.uint64(shift)
+        t = mask & (me << s)
+        for _ in range(5):
+            t |= mask & (t << s)
+        legal |= t << s
+        t = mask & (me >> s)
+        for _ in range(5):
+            t |= mask & (t >> s)
+        legal |= t >> s
+    return legal & ~(me | opp)
+
+
+def features(me: np.ndarray, opp: np.ndarray) -> np.ndarray:
+    """手番側から見た特徴量 (N, N_FEATURES)。評価値は features @ theta"""
+    bm, bo = _bits(me), _bits(opp)
+    diff = bm.astype(np.float32) - bo.astype(np.float32)
+    x = np.empty((len(me), N_FEATURES), np.float32)
+    x[:, :N_CLASSES] = diff @ _CLASS_MATRIX
+    x[:, MOBILITY] = _popcount(_legal(me, opp)) - _popcount(_legal(opp, me))
+    x[:, PATTERN_X] = 0.0
+    x[:, PATTERN_C] = 0.0
+    for corner, xsq, csqs in _CORNER_SQUARES:
+        empty = 1.0 - (bm[:, corner] | bo[:, corner]).astype(np.float32)
+        x[:, PATTERN_X] += empty * diff[:, xsq]
+        x[:, PATTERN_C] += empty * diff[:, csqs].sum(axis=1)
+    return x
+
+
+def _gradient(theta: np.ndarray, records: np.ndarray):
+    """(勾配の和, 損失の和, 件数) を返す"""
+    x = features(records["me"], records["opp"])
+    y = records["result"].astype(np.float32)
+    z = x @ theta.astype(np.float32) / SCALE
+    p = 1.0 / (1.0 + np.exp(-z))
+    loss = np.logaddexp(0.0, z) - y * z
+    grad = x.T @ (p - y) / SCALE
+    return grad.astype(np.float64), float(loss.sum()), len(records)
+
+
+# --- 局面ファイル -------------------------------------------------------------
+
+def open_positions(path: str) -> np.ndarray:
+    """局面ファイルを読み取り専用でメモリマップする"""
+    return np.memmap(path, dtype=POSITION_DTYPE, mode="r")
+
+
+def _records(board: BitboardOthello, color: Color, result: float) -> tuple:
+    if color == Color.BLACK:
+        return board.black, board.white, result
+    return board.white, board.black, result
+
+
+def _result(black_count: int, white_count: int, color: Color) -> float:
+    me, opp = (black_count, white_count) if color == Color.BLACK else (white_count, black_count)
+    return 1.0 if me > opp else 0.5 if me == opp else 0.0
+
+
+def play_positions(ai: str, seed: int, random_plies: int = 8) -> np.ndarray:
+    """ai 同士で 1 局打ち、random_plies 手目以降の局面を結果付きで返す
+
+    序盤 random_plies 手はランダムに打つ (決定的な AI 同士でも毎局違う局面になるように)。
+    """
+    random.seed(seed)
+    ai_class = registry.resolve(ai)
+    board = BitboardOthello()
+    players = {Color.BLACK: ai_class(Color.BLACK, board), Color.WHITE: ai_class(Color.WHITE, board)}
+    positions = []
+    color = Color.BLACK
+    pass_count = 0
+    ply = 0
+    while pass_count < 2:
+        legal = board.get_legal_moves(color)
+        if not legal:
+            pass_count += 1
+            color = color.other
+            continue
+        pass_count = 0
+        if ply < random_plies:
+            move = random.choice(legal)
+        else:
+            positions.append((board.copy(), color))
+            move = players[color].place()
+        board.make_move(move[0], move[1], color)
+        color = color.other
+        ply += 1
+
+    black_count, white_count = board.count_stones()
+    return np.array(
+        [_records(b, c, _result(black_count, white_count, c)) for b, c in positions], dtype=POSITION_DTYPE
+    )
+
+
+def game_positions(moves: Sequence[Move]) -> np.ndarray:
+    """棋譜 1 局分の局面を結果付きで返す"""
+    positions = [(board, color) for board, color, move in replay_moves(list(moves)) if move is not None]
+    final = BitboardOthello()
+    if positions:
+        last_board, last_color = positions[-1]
+        final = last_board.copy()
+        last_move = [m for m in moves if m is not None][-1]
+        final.make_move(last_move[0], last_move[1], last_color)
+    black_count, white_count = final.count_stones()
+    return np.array(
+        [_records(b, c, _result(black_count, white_count, c)) for b, c in positions], dtype=POSITION_DTYPE
+    )
+
+
+def _write_shuffled(f, chunks: List[np.ndarray], rng: np.random.Generator) -> int:
+    """同じ局の局面が 1 つのバッチに偏らないよう、まとめた局をシャッフルして書く"""
+    if not chunks:
+        return 0
+    data = np.concatenate(chunks)
+    rng.shuffle(data)
+    data.tofile(f)
+    return len(data)
+
+
+def generate(out: str, games: int, ai: str = "random", workers: Optional[int] = None, seed: int = 0,
+             random_plies: int = 8, chunk_games: int = 1000,
+             callback: Optional[Callable[[int, int], None]] = None) -> int:
+    """自己対局で局面ファイルを作り (追記)、書いた局面数を返す
+
+    chunk_games 局ずつ並列に打って書き出すので、メモリ使用量は局数によらない。
+    """
+    registry.resolve(ai)
+    rng = np.random.default_rng(seed)
+    written = 0
+    with ProcessPoolExecutor(workers) as pool, open(out, "ab") as f:
+        for start in range(0, games, chunk_games):
+            seeds = range(seed + start, seed + min(start + chunk_games, games))
+            chunks = list(pool.map(play_positions, [ai] * len(seeds), seeds, [random_plies] * len(seeds)))
+            written += _write_shuffled(f, chunks, rng)
+            if callback is not None:
+                callback(start + len(seeds), written)
+    return written
+
+
+def convert(games: Iterable[Sequence[Move]], out: str, seed: int = 0, chunk_games: int = 1000) -> int:
+    """棋譜から局面ファイルを作り (追記)、書いた局面数を返す"""
+    rng = np.random.default_rng(seed)
+    written = 0
+    chunks: List[np.ndarray] = []
+    with open(out, "ab") as f:
+        for moves in games:
+            chunks.append(game_positions(moves))
+            if len(chunks) >= chunk_games:
+                written += _write_shuffled(f, chunks, rng)
+                chunks = []
+        written += _write_shuffled(f, chunks, rng)
+    return written
+
+
+# --- 学習 -------------------------------------------------------------------
+
+def initial_theta(path: Optional[str] = None) -> np.ndarray:
+    """既定の評価関数 (または既存の重みファイル) から始める"""
+    squares, mobility, pattern = list(EVAL_SQUARE_WEIGHTS), EVAL_MOBILITY_WEIGHT, None
+    if path is not None:
+        squares, file_mobility, pattern = load_eval_weights(path)
+        if file_mobility is not None:
+            mobility = file_mobility
+    theta = np.zeros(N_FEATURES)
+    # 同じ種類のマスの平均から始める
+    theta[:N_CLASSES] = np.asarray(squares, np.float64) @ _CLASS_MATRIX / _CLASS_MATRIX.sum(axis=0)
+    theta[MOBILITY] = mobility
+    if pattern is not None:
+        theta[PATTERN_X], theta[PATTERN_C] = pattern
+    return theta
+
+
+def to_weights(theta: np.ndarray) -> dict:
+    """weights.py の形式 ("eval", "mobility", "pattern") に変換する"""
+    return {
+        "eval": [int(round(theta[SQUARE_CLASS[sq]])) for sq in range(64)],
+        "mobility": int(round(theta[MOBILITY])),
+        "pattern": [int(round(theta[PATTERN_X])), int(round(theta[PATTERN_C]))],
+    }
+
+
+_worker_data: Optional[np.ndarray] = None
+
+
+def _init_worker(path: str) -> None:
+    global _worker_data
+    _worker_data = open_positions(path)
+
+
+def _block_gradient(theta: np.ndarray, start: int, stop: int):
+    return _gradient(theta, np.asarray(_worker_data[start:stop]))
+
+
+@dataclass
+class FitResult:
+    theta: np.ndarray
+    positions: int
+    steps: int = 0
+    train_loss: List[float] = field(default_factory=list)  # エポックごとの平均損失
+    validation_loss: List[float] = field(default_factory=list)
+
+    def weights(self) -> dict:
+        return to_weights(self.theta)
+
+
+def fit(path: str, epochs: int = 3, batch_size: int = 65536, lr: float = 0.5, workers: int = 1,
+        validation: float = 0.05, seed: int = 0, init: Optional[str] = None,
+        callback: Optional[Callable[[int, FitResult], None]] = None) -> FitResult:
+    """局面ファイルから重みを学習する
+
+    1 ステップで workers 個のバッチの勾配をそれぞれのプロセスで計算して足し合わせ、
+    Adam で更新する (workers=1 ならこのプロセスで計算する)。
+    末尾の validation の割合の局面は学習に使わず、エポックごとの検証損失に使う。
+    """
+    data = open_positions(path)
+    n = len(data)
+    n_validation = int(n * validation)
+    n_train = n - n_validation
+    if n_train <= 0:
+        raise ValueError(f"{path}: no positions to train on")
+
+    train_blocks = [(s, min(s + batch_size, n_train)) for s in range(0, n_train, batch_size)]
+    validation_blocks = [(s, min(s + batch_size, n)) for s in range(n_train, n, batch_size)]
+    result = FitResult(initial_theta(init), n)
+    rng = np.random.default_rng(seed)
+    m = np.zeros(N_FEATURES)
+    v = np.zeros(N_FEATURES)
+    beta1, beta2, eps = 0.9, 0.999, 1e-8
+
+    pool = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(path,)) if workers > 1 else None
+
+    def gradients(blocks):
+        if pool is None:
+            return [_gradient(result.theta, np.asarray(data[s:e])) for s, e in blocks]
+        return list(pool.map(_block_gradient, [result.theta] * len(blocks), *zip(*blocks)))
+
+    try:
+        for epoch in range(epochs):
+            # バッチの順番を毎エポック入れ替える
+            order = rng.permutation(len(train_blocks))
+            loss_sum, count = 0.0, 0
+            for i in range(0, len(order), workers):
+                grads = gradients([train_blocks[j] for j in order[i:i + workers]])
+                grad = sum(g for g, _, _ in grads)
+                batch_count = sum(c for _, _, c in grads)
+                loss_sum += sum(l for _, l, _ in grads)
+                count += batch_count
+
+                grad = grad / batch_count
+                result.steps += 1
+                m = beta1 * m + (1 - beta1) * grad
+                v = beta2 * v + (1 - beta2) * grad * grad
+                m_hat = m / (1 - beta1 ** result.steps)
+                v_hat = v / (1 - beta2 ** result.steps)
+                result.theta = result.theta - lr * m_hat / (np.sqrt(v_hat) + eps)
+            result.train_loss.append(loss_sum / count)
+
+            if validation_blocks:
+                grads = []
+                for i in range(0, len(validation_blocks), workers):
+                    grads += gradients(validation_blocks[i:i + workers])
+                result.validation_loss.append(sum(l for _, l, _ in grads) / sum(c for _, _, c in grads))
+            if callback is not None:
+                callback(epoch, result)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return result
+
+
+def export(result: FitResult, path: str) -> None:
+    save_weights(path, result.weights())
@@ -0,0 +1,55 @@
+"""AI が使う重みファイルの読み書き
+
+JSON 形式で、キーごとに 64 マス分の値を持つ。マスの並びは y * 8 + x (左上から行ごと)。
+
+    {"playout": [32, 1, 8, ...]}
+
+AlphaBetaAI の評価関数は "eval" (64 マス)、"mobility" (着手可能数の差の係数、スカラー)、
+"pattern" (隅が空いているときの [X マス, C マス] の石 1 つあたりの値) を使う。
+modules/tune.py はこの形式で書き出す。
+"""
+import json
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+
+def load_weights(path: str) -> Dict[str, list]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_weights(path: str, weights: Dict[str, Union[Sequence, float]]) -> None:
+    data = {key: value if isinstance(value, (int, float)) else list(value) for key, value in weights.items()}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=1)
+
+
+def load_square_weights(path: str, key: str) -> List:
+    """重みファイルから 64 マス分の表を 1 つ取り出す"""
+    table = load_weights(path)[key]
+    if len(table) != 64:
+        raise ValueError(f"{path}: {key!r} must have 64 entries, got {len(table)}")
+    return table
+
+
+def load_playout_weights(path: str) -> List[int]:
+    """heavy プレイアウトの重み ("playout") を読む。0 以上の整数だけを受け付ける"""
+    table = load_square_weights(path, "playout")
+    for w in table:
+        if isinstance(w, bool) or not isinstance(w, int) or not 0 <= w <= 0xFFFFFFFF:
+            raise ValueError(f"{path}: 'playout' entries must be non-negative integers, got {w!r}")
+    return table
+
+
+def load_eval_weights(path: str) -> Tuple[List[int], Optional[int], Optional[List[int]]]:
+    """探索の評価関数の (マスごとの重み, mobility の係数, pattern) を読む。無いキーは None"""
+    squares = [int(round(w)) for w in load_square_weights(path, "eval")]
+    weights = load_weights(path)
+    mobility = weights.get("mobility")
+    pattern = weights.get("pattern")
+    if pattern is not None and len(pattern) != 2:
+        raise ValueError(f"{path}: 'pattern' must have 2 entries, got {len(pattern)}")
+    return (
+        squares,
+        None if mobility is None else int(round(mobility)),
+        None if pattern is None else [int(round(w)) for w in pattern],
+    )
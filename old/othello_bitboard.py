@@ -86,22 +86,11 @@ class BitboardOthello:
         if shift == 8:   return (b << 8) & 0xffffffffffffffff # 下
         if shift == -8:  return (b >> 8)                # 上
         
-        if shift == 9:   return (b & MASK_NOT_H) << 9   # 右下
-        if shift == -9:  return (b & MASK_NOT_A) >> 9   # 左上
-        if shift == 7:   return (b & MASK_NOT_A) << 7   # 左下 (左+1, 下+8 = +7 は間違い。左は-1なので 8-1=7) -> 実は 左下は +7
-        # 検証: index 8 (1,0) -> 左下 (0,1) index 1.  8 -> 1 は -7 ?
-        # 座標: (x, y). index = y*8 + x
-        # 右下 (+1, +1) -> +9
-        # 左上 (-1, -1) -> -9
-        # 左下 (-1, +1) -> -1 + 8 = +7
-        # 右上 (+1, -1) -> +1 - 8 = -7
-        
-        # なので：
-        # +7 (左下): 左(-1)を含むので A列マスク & 左シフト
-        if shift == 7:   return (b & MASK_NOT_A) << 7
-        # -7 (右上): 右(+1)を含むので H列マスク & 右シフト
-        if shift == -7:  return (b & MASK_NOT_H) >> 7
-        
+        if shift == 9:   return (b & MASK_NOT_H) << 9   # 右下 (+1, +1)
+        if shift == -9:  return (b & MASK_NOT_A) >> 9   # 左上 (-1, -1)
+        if shift == 7:   return (b & MASK_NOT_A) << 7   # 左下 (-1, +1)
+        if shift == -7:  return (b & MASK_NOT_H) >> 7   # 右上 (+1, -1)
+
         return 0
 
     def get_legal_moves_bits(self, attacker_color: Color) -> int:
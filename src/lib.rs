@@ -1,11 +1,14 @@
 use pyo3::prelude::*;
+use pyo3::exceptions::PyValueError;
+use std::sync::atomic::{AtomicBool, AtomicU64, Ordering};
+use std::time::Instant;
 
 // マスク定義
 const MASK_NOT_A: u64 = 0xfefefefefefefefe; // 左端列(A列)以外
 const MASK_NOT_H: u64 = 0x7f7f7f7f7f7f7f7f; // 右端列(H列)以外
 
-#[pyclass]
-#[derive(Clone, Copy, PartialEq, Debug)]
+#[pyclass(eq, eq_int, frozen, hash)]
+#[derive(Clone, Copy, PartialEq, Eq, Hash, Debug)]
 pub enum Color {
     BLACK = 0,
     WHITE = 1,
@@ -29,6 +32,15 @@ impl Color {
     }
 }
 
+/// 盤面。
+///
+/// スレッド安全性: 1 つのインスタンスを複数のスレッドで共有してよいのは、全員が読むだけの
+/// 場合に限る。make_move など変更するメソッドを別のスレッドの呼び出しと同時に使うと、
+/// (free-threaded 版の Python でも) 盤面が壊れることはないが RuntimeError (Already borrowed)
+/// になる。スレッドごとに copy() するか、他のスレッドには snapshot() を渡すこと。
+/// 時間のかかるメソッド (playout, playout_wins, search) は盤面をコピーし、借用を返してから
+/// GIL を解放して実行する。実行中に別のスレッドが元の盤面を make_move で変更してもよく、
+/// 結果は呼び出した時点の盤面のものになる。
 #[pyclass]
 #[derive(Clone, Copy)]
 struct BitboardOthello {
@@ -46,6 +58,12 @@ impl BitboardOthello {
         }
     }
 
+    /// ビットボードから盤面を作る
+    #[staticmethod]
+    fn from_bits(black: u64, white: u64) -> Self {
+        BitboardOthello { black, white }
+    }
+
     #[getter]
     fn get_black(&self) -> u64 { self.black }
     #[getter]
@@ -65,16 +83,7 @@ impl BitboardOthello {
             return false;
         }
 
-        match color {
-            Color::BLACK => {
-                self.black |= pos | rev;
-                self.white &= !rev;
-            }
-            Color::WHITE => {
-                self.white |= pos | rev;
-                self.black &= !rev;
-            }
-        }
+        self.apply_move(pos, rev, color);
         true
     }
 
@@ -83,33 +92,8 @@ impl BitboardOthello {
     }
 
     fn get_legal_moves_bits(&self, color: Color) -> u64 {
-        let (me, opp) = match color {
-            Color::BLACK => (self.black, self.white),
-            Color::WHITE => (self.white, self.black),
-        };
-
-        let blank = !(self.black | self.white);
-        let mut legal = 0;
-
-        let directions: [(i32, u64); 8] = [
-            (1, MASK_NOT_A),  // 右
-            (-1, MASK_NOT_H), // 左
-            (8, 0xffffffffffffffff), // 下
-            (-8, 0xffffffffffffffff), // 上
-            (7, MASK_NOT_H),  // 左下
-            (-7, MASK_NOT_A), // 右上
-            (9, MASK_NOT_A),  // 右下
-            (-9, MASK_NOT_H), // 左上
-        ];
-
-        for (d, mask) in directions {
-            let mut t = self.shift_raw(me, d) & opp & mask;
-            for _ in 0..5 {
-                t |= self.shift_raw(t, d) & opp & mask;
-            }
-            legal |= self.shift_raw(t, d) & blank & mask;
-        }
-        legal
+        let (me, opp) = self.me_opp(color);
+        legal_moves(me, opp)
     }
 
     fn get_legal_moves(&self, color: Color) -> Vec<(i32, i32)> {
@@ -125,45 +109,703 @@ impl BitboardOthello {
 
     fn copy(&self) -> Self { *self }
     fn __copy__(&self) -> Self { *self }
+
+    /// color の手番で alpha-beta 探索し、最善手を返す。
+    /// threads > 1 なら Lazy SMP (全スレッドが同じ局面を深さをずらして探索し、
+    /// 置換表を共有する) で並列に探索する。探索中は GIL を解放する。
+    /// pattern は隅が空いているときの [X 打ち, C 打ち] の石 1 つあたりの評価値。
+    #[pyo3(signature = (color, depth, threads=1, hash_mb=16, weights=None, mobility=DEFAULT_MOBILITY_WEIGHT, pattern=None))]
+    fn search(
+        slf: PyRef<'_, Self>,
+        py: Python,
+        color: Color,
+        depth: u32,
+        threads: usize,
+        hash_mb: usize,
+        weights: Option<Vec<i32>>,
+        mobility: i32,
+        pattern: Option<Vec<i32>>,
+    ) -> PyResult<SearchResult> {
+        let mut squares = DEFAULT_SQUARE_WEIGHTS;
+        if let Some(w) = weights {
+            if w.len() != 64 {
+                return Err(PyValueError::new_err("weights must have 64 entries"));
+            }
+            squares.copy_from_slice(&w);
+        }
+        let mut corner = [0i32; 2];
+        if let Some(p) = pattern {
+            if p.len() != 2 {
+                return Err(PyValueError::new_err("pattern must have 2 entries"));
+            }
+            corner.copy_from_slice(&p);
+        }
+        let evaluator = Evaluator { squares, mobility, corner };
+        // 盤面をコピーして借用を返してから GIL を解放する (探索中も元の盤面を変更できる)
+        let (me, opp) = slf.me_opp(color);
+        drop(slf);
+        let depth = depth.clamp(1, 60);
+        let threads = threads.max(1);
+        Ok(py.allow_threads(move || lazy_smp(me, opp, depth, threads, hash_mb, &evaluator)))
+    }
+
+    /// 現在の盤面の不変スナップショットを返す
+    fn snapshot(&self) -> BoardSnapshot {
+        BoardSnapshot { black: self.black, white: self.white }
+    }
+
+    /// color の手番から終局までプレイアウトし、終局時の (黒石数, 白石数) を返す。
+    /// policy を渡すとその重みに比例した確率で、省略すると一様に手を選ぶ。
+    #[pyo3(signature = (color, policy=None, seed=0))]
+    fn playout(slf: PyRef<'_, Self>, py: Python, color: Color, policy: Option<PyRef<PlayoutPolicy>>, seed: u64) -> (u32, u32) {
+        let mut board = *slf;
+        drop(slf);
+        let policy: Option<PlayoutPolicy> = policy.map(|p| (*p).clone());
+        py.allow_threads(move || {
+            let mut rng = XorShift64::new(seed);
+            board.run_playout(color, policy.as_ref(), &mut rng);
+            board.count_stones()
+        })
+    }
+
+    /// to_move の手番から n 回プレイアウトし、color 側の (勝ち数, 引き分け数) を返す。
+    /// 時間がかかるので GIL を解放して実行する。
+    #[pyo3(signature = (color, to_move, n, policy=None, seed=0))]
+    fn playout_wins(
+        slf: PyRef<'_, Self>,
+        py: Python,
+        color: Color,
+        to_move: Color,
+        n: u32,
+        policy: Option<PyRef<PlayoutPolicy>>,
+        seed: u64,
+    ) -> (u32, u32) {
+        let start = *slf;
+        drop(slf);
+        let policy: Option<PlayoutPolicy> = policy.map(|p| (*p).clone());
+        py.allow_threads(move || {
+            let mut rng = XorShift64::new(seed);
+            let (mut wins, mut draws) = (0, 0);
+            for _ in 0..n {
+                let mut board = start;
+                board.run_playout(to_move, policy.as_ref(), &mut rng);
+                let (black, white) = board.count_stones();
+                let (me, opp) = match color {
+                    Color::BLACK => (black, white),
+                    Color::WHITE => (white, black),
+                };
+                if me > opp {
+                    wins += 1;
+                } else if me == opp {
+                    draws += 1;
+                }
+            }
+            (wins, draws)
+        })
+    }
+}
+
+/// 盤面の不変スナップショット。
+/// 作成後は変更できないので、ロック無しで別スレッドから読んでよく、辞書のキーにも使える。
+#[pyclass(frozen, eq, hash)]
+#[derive(Clone, Copy, PartialEq, Eq, Hash)]
+struct BoardSnapshot {
+    #[pyo3(get)]
+    black: u64,
+    #[pyo3(get)]
+    white: u64,
+}
+
+#[pymethods]
+impl BoardSnapshot {
+    #[new]
+    fn new(black: u64, white: u64) -> Self {
+        BoardSnapshot { black, white }
+    }
+
+    fn count_stones(&self) -> (u32, u32) {
+        (self.black.count_ones(), self.white.count_ones())
+    }
+
+    /// 同じ盤面の (変更可能な) BitboardOthello を作る
+    fn to_board(&self) -> BitboardOthello {
+        BitboardOthello { black: self.black, white: self.white }
+    }
+
+    fn __repr__(&self) -> String {
+        format!("BoardSnapshot(black=0x{:016x}, white=0x{:016x})", self.black, self.white)
+    }
+}
+
+/// プレイアウトで手を選ぶときのマスごとの重み (作成後は変更できない)
+#[pyclass(frozen)]
+#[derive(Clone)]
+struct PlayoutPolicy {
+    weights: [u32; 64],
+}
+
+#[pymethods]
+impl PlayoutPolicy {
+    #[new]
+    fn new(weights: Vec<u32>) -> PyResult<Self> {
+        if weights.len() != 64 {
+            return Err(PyValueError::new_err("weights must have 64 entries"));
+        }
+        let mut w = [0u32; 64];
+        w.copy_from_slice(&weights);
+        Ok(PlayoutPolicy { weights: w })
+    }
+
+    #[getter]
+    fn weights(&self) -> Vec<u32> { self.weights.to_vec() }
+}
+
+impl PlayoutPolicy {
+    /// 合法手の中から重みに比例した確率で 1 手選ぶ (累積和によるサンプリング)
+    fn choose(&self, legal: u64, rng: &mut XorShift64) -> u64 {
+        let mut total: u64 = 0;
+        let mut bits = legal;
+        while bits != 0 {
+            total += self.weights[bits.trailing_zeros() as usize] as u64;
+            bits &= bits - 1;
+        }
+        // 重みが全部 0 なら一様に選ぶ
+        if total == 0 {
+            return nth_bit(legal, rng.below(legal.count_ones()));
+        }
+
+        let mut r = ((rng.next_u64() as u128 * total as u128) >> 64) as u64;
+        let mut bits = legal;
+        loop {
+            let sq = bits.trailing_zeros();
+            let w = self.weights[sq as usize] as u64;
+            if r < w {
+                return 1 << sq;
+            }
+            r -= w;
+            bits &= bits - 1;
+        }
+    }
+}
+
+/// プレイアウト用の xorshift64 乱数
+struct XorShift64(u64);
+
+impl XorShift64 {
+    fn new(seed: u64) -> Self {
+        // 0 は固定点になるので、シードを混ぜてから最下位ビットを立てる
+        XorShift64(seed.wrapping_mul(0x9E3779B97F4A7C15) | 1)
+    }
+
+    #[inline(always)]
+    fn next_u64(&mut self) -> u64 {
+        let mut x = self.0;
+        x ^= x << 13;
+        x ^= x >> 7;
+        x ^= x << 17;
+        self.0 = x;
+        x
+    }
+
+    /// 0..n の一様乱数 (n > 0)
+    #[inline(always)]
+    fn below(&mut self, n: u32) -> u32 {
+        (((self.next_u64() >> 32) * n as u64) >> 32) as u32
+    }
+}
+
+/// n 番目 (0 始まり) に立っているビットだけを返す
+#[inline(always)]
+fn nth_bit(mut bits: u64, n: u32) -> u64 {
+    for _ in 0..n {
+        bits &= bits - 1;
+    }
+    bits & bits.wrapping_neg()
 }
 
 impl BitboardOthello {
+    #[inline(always)]
+    fn apply_move(&mut self, pos: u64, rev: u64, color: Color) {
+        match color {
+            Color::BLACK => {
+                self.black |= pos | rev;
+                self.white &= !rev;
+            }
+            Color::WHITE => {
+                self.white |= pos | rev;
+                self.black &= !rev;
+            }
+        }
+    }
+
+    fn run_playout(&mut self, mut color: Color, policy: Option<&PlayoutPolicy>, rng: &mut XorShift64) {
+        let mut pass_count = 0;
+        while pass_count < 2 {
+            let legal = self.get_legal_moves_bits(color);
+            if legal != 0 {
+                let pos = match policy {
+                    Some(p) => p.choose(legal, rng),
+                    None => nth_bit(legal, rng.below(legal.count_ones())),
+                };
+                let rev = self.get_flippable(pos, color);
+                self.apply_move(pos, rev, color);
+                pass_count = 0;
+            } else {
+                pass_count += 1;
+            }
+            color = color.other();
+        }
+    }
+
     fn get_flippable(&self, pos: u64, color: Color) -> u64 {
-        let (me, opp) = match color {
+        let (me, opp) = self.me_opp(color);
+        flippable(pos, me, opp)
+    }
+
+    #[inline(always)]
+    fn me_opp(&self, color: Color) -> (u64, u64) {
+        match color {
             Color::BLACK => (self.black, self.white),
             Color::WHITE => (self.white, self.black),
+        }
+    }
+}
+
+// 8方向のシフト量と、シフト後に端の回り込みを消すマスク
+const DIRECTIONS: [(i32, u64); 8] = [
+    (1, MASK_NOT_A),  // 右
+    (-1, MASK_NOT_H), // 左
+    (8, 0xffffffffffffffff), // 下
+    (-8, 0xffffffffffffffff), // 上
+    (7, MASK_NOT_H),  // 左下
+    (-7, MASK_NOT_A), // 右上
+    (9, MASK_NOT_A),  // 右下
+    (-9, MASK_NOT_H), // 左上
+];
+
+/// 手番側の石 me と相手の石 opp から合法手のビットを求める
+#[inline]
+fn legal_moves(me: u64, opp: u64) -> u64 {
+    let blank = !(me | opp);
+    let mut legal = 0;
+    for (d, mask) in DIRECTIONS {
+        let mut t = shift_raw(me, d) & opp & mask;
+        for _ in 0..5 {
+            t |= shift_raw(t, d) & opp & mask;
+        }
+        legal |= shift_raw(t, d) & blank & mask;
+    }
+    legal
+}
+
+/// pos に打ったときに反転する石のビット
+#[inline]
+fn flippable(pos: u64, me: u64, opp: u64) -> u64 {
+    let mut rev = 0;
+    for (d, mask) in DIRECTIONS {
+        let mut line_rev = 0;
+        let mut tmp_pos = shift_raw(pos, d) & mask;
+        while tmp_pos != 0 && (tmp_pos & opp) != 0 {
+            line_rev |= tmp_pos;
+            tmp_pos = shift_raw(tmp_pos, d) & mask;
+        }
+        if tmp_pos != 0 && (tmp_pos & me) != 0 {
+            rev |= line_rev;
+        }
+    }
+    rev
+}
+
+#[inline(always)]
+fn shift_raw(b: u64, d: i32) -> u64 {
+    if d > 0 { b << d } else { b >> (-d) }
+}
+
+// --- alpha-beta 探索 -------------------------------------------------------
+
+const INF: i32 = 1_000_000;
+const WIN: i32 = 100_000;
+const DEFAULT_MOBILITY_WEIGHT: i32 = 5;
+// マスごとの評価値 (y * 8 + x の順)
+const DEFAULT_SQUARE_WEIGHTS: [i32; 64] = [
+    100, -20, 10,  5,  5, 10, -20, 100,
+    -20, -50, -2, -2, -2, -2, -50, -20,
+     10,  -2, -1, -1, -1, -1,  -2,  10,
+      5,  -2, -1, -1, -1, -1,  -2,   5,
+      5,  -2, -1, -1, -1, -1,  -2,   5,
+     10,  -2, -1, -1, -1, -1,  -2,  10,
+    -20, -50, -2, -2, -2, -2, -50, -20,
+    100, -20, 10,  5,  5, 10, -20, 100,
+];
+
+/// 探索結果
+#[pyclass(frozen)]
+#[derive(Clone)]
+struct SearchResult {
+    /// 最善手 (打てる手が無ければ None)
+    #[pyo3(get)]
+    best_move: Option<(i32, i32)>,
+    /// 手番側から見た評価値 (終局まで読み切った場合は ±100000 + 石差)
+    #[pyo3(get)]
+    score: i32,
+    /// 読み切った深さ
+    #[pyo3(get)]
+    depth: u32,
+    /// 全スレッドの探索ノード数の合計
+    #[pyo3(get)]
+    nodes: u64,
+    /// 探索にかかった秒数
+    #[pyo3(get)]
+    elapsed: f64,
+    /// 深さ 1, 2, ... の探索が終わった時点の経過秒数 (time-to-depth)
+    #[pyo3(get)]
+    depth_times: Vec<f64>,
+}
+
+#[pymethods]
+impl SearchResult {
+    fn __repr__(&self) -> String {
+        format!(
+            "SearchResult(best_move={:?}, score={}, depth={}, nodes={}, elapsed={:.3})",
+            self.best_move, self.score, self.depth, self.nodes, self.elapsed
+        )
+    }
+}
+
+// (隅, X マス, C マス) のビット
+const CORNER_REGIONS: [(u64, u64, u64); 4] = [
+    (1 << 0, 1 << 9, (1 << 1) | (1 << 8)),
+    (1 << 7, 1 << 14, (1 << 6) | (1 << 15)),
+    (1 << 56, 1 << 49, (1 << 57) | (1 << 48)),
+    (1 << 63, 1 << 54, (1 << 62) | (1 << 55)),
+];
+
+struct Evaluator {
+    squares: [i32; 64],
+    mobility: i32,
+    /// 隅が空いているときの X マス・C マスの石 1 つあたりの評価値 (マスの重みに加える)
+    corner: [i32; 2],
+}
+
+impl Evaluator {
+    fn eval(&self, me: u64, opp: u64) -> i32 {
+        let mut score = 0;
+        let mut b = me;
+        while b != 0 {
+            score += self.squares[b.trailing_zeros() as usize];
+            b &= b - 1;
+        }
+        let mut b = opp;
+        while b != 0 {
+            score -= self.squares[b.trailing_zeros() as usize];
+            b &= b - 1;
+        }
+        if self.mobility != 0 {
+            let diff = legal_moves(me, opp).count_ones() as i32 - legal_moves(opp, me).count_ones() as i32;
+            score += self.mobility * diff;
+        }
+        if self.corner != [0, 0] {
+            let empty = !(me | opp);
+            for &(corner, x, c) in CORNER_REGIONS.iter() {
+                if empty & corner != 0 {
+                    let dx = (me & x).count_ones() as i32 - (opp & x).count_ones() as i32;
+                    let dc = (me & c).count_ones() as i32 - (opp & c).count_ones() as i32;
+                    score += self.corner[0] * dx + self.corner[1] * dc;
+                }
+            }
+        }
+        score
+    }
+}
+
+const BOUND_EXACT: u64 = 0;
+const BOUND_LOWER: u64 = 1;
+const BOUND_UPPER: u64 = 2;
+const NO_MOVE: u8 = 64;
+
+/// 置換表の 1 エントリ。key には (局面のハッシュ ^ data) を入れておき、
+/// 読むときに key ^ data がハッシュと一致するかで、別スレッドの書き込みと
+/// 混ざった (torn) エントリを捨てる。ロックは使わない。
+struct TTEntry {
+    key: AtomicU64,
+    data: AtomicU64,
+}
+
+#[derive(Clone, Copy)]
+struct TTData {
+    score: i32,
+    depth: u8,
+    bound: u64,
+    best: u8,
+}
+
+impl TTData {
+    fn pack(self) -> u64 {
+        (self.score as u32 as u64)
+            | ((self.depth as u64) << 32)
+            | (self.bound << 40)
+            | ((self.best as u64) << 42)
+    }
+
+    fn unpack(data: u64) -> Self {
+        TTData {
+            score: data as u32 as i32,
+            depth: (data >> 32) as u8,
+            bound: (data >> 40) & 3,
+            best: ((data >> 42) & 0x7f) as u8,
+        }
+    }
+}
+
+struct TranspositionTable {
+    entries: Vec<TTEntry>,
+    mask: u64,
+}
+
+impl TranspositionTable {
+    fn new(hash_mb: usize) -> Self {
+        let wanted = (hash_mb.max(1) << 20) / std::mem::size_of::<TTEntry>();
+        // 2 のべき乗に切り下げる
+        let len = 1usize << (usize::BITS - 1 - wanted.leading_zeros());
+        let entries = (0..len)
+            .map(|_| TTEntry { key: AtomicU64::new(0), data: AtomicU64::new(0) })
+            .collect();
+        TranspositionTable { entries, mask: (len - 1) as u64 }
+    }
+
+    fn probe(&self, hash: u64) -> Option<TTData> {
+        let entry = &self.entries[(hash & self.mask) as usize];
+        let data = entry.data.load(Ordering::Relaxed);
+        let key = entry.key.load(Ordering::Relaxed);
+        if key ^ data == hash && data != 0 {
+            Some(TTData::unpack(data))
+        } else {
+            None
+        }
+    }
+
+    fn store(&self, hash: u64, value: TTData) {
+        let entry = &self.entries[(hash & self.mask) as usize];
+        // 別の局面か、より深く読んだ結果なら上書きする
+        let old_data = entry.data.load(Ordering::Relaxed);
+        let old_key = entry.key.load(Ordering::Relaxed);
+        if old_key ^ old_data == hash && TTData::unpack(old_data).depth > value.depth {
+            return;
+        }
+        let data = value.pack();
+        entry.key.store(hash ^ data, Ordering::Relaxed);
+        entry.data.store(data, Ordering::Relaxed);
+    }
+}
+
+#[inline]
+fn position_hash(me: u64, opp: u64) -> u64 {
+    let mut h = me.wrapping_mul(0x9E3779B97F4A7C15) ^ opp.rotate_left(32).wrapping_mul(0xC2B2AE3D27D4EB4F);
+    h ^= h >> 29;
+    h = h.wrapping_mul(0xBF58476D1CE4E5B9);
+    h ^ (h >> 32)
+}
+
+fn final_score(me: u64, opp: u64) -> i32 {
+    let diff = me.count_ones() as i32 - opp.count_ones() as i32;
+    if diff > 0 {
+        WIN + diff
+    } else if diff < 0 {
+        -WIN + diff
+    } else {
+        0
+    }
+}
+
+struct Searcher<'a> {
+    tt: &'a TranspositionTable,
+    evaluator: &'a Evaluator,
+    stop: &'a AtomicBool,
+    nodes: u64,
+    aborted: bool,
+}
+
+impl<'a> Searcher<'a> {
+    /// 合法手を置換表の手、マスの評価値の順に並べる
+    fn order_moves(&self, legal: u64, tt_move: u8, buf: &mut [u8; 64]) -> usize {
+        let mut n = 0;
+        let mut bits = legal;
+        while bits != 0 {
+            buf[n] = bits.trailing_zeros() as u8;
+            n += 1;
+            bits &= bits - 1;
+        }
+        let squares = &self.evaluator.squares;
+        buf[..n].sort_by_key(|&sq| {
+            if sq == tt_move { i32::MIN } else { -squares[sq as usize] }
+        });
+        n
+    }
+
+    fn negamax(&mut self, me: u64, opp: u64, depth: u32, mut alpha: i32, mut beta: i32) -> i32 {
+        self.nodes += 1;
+        if self.stop.load(Ordering::Relaxed) {
+            self.aborted = true;
+            return 0;
+        }
+
+        let legal = legal_moves(me, opp);
+        if legal == 0 {
+            if legal_moves(opp, me) == 0 {
+                return final_score(me, opp);
+            }
+            // パス (連続パスは終局なので深さは減らさなくても止まる)
+            return -self.negamax(opp, me, depth, -beta, -alpha);
+        }
+        if depth == 0 {
+            return self.evaluator.eval(me, opp);
+        }
+
+        let hash = position_hash(me, opp);
+        let alpha_orig = alpha;
+        let mut tt_move = NO_MOVE;
+        if let Some(e) = self.tt.probe(hash) {
+            tt_move = e.best;
+            if e.depth as u32 >= depth {
+                match e.bound {
+                    BOUND_EXACT => return e.score,
+                    BOUND_LOWER => alpha = alpha.max(e.score),
+                    _ => beta = beta.min(e.score),
+                }
+                if alpha >= beta {
+                    return e.score;
+                }
+            }
+        }
+
+        let mut buf = [0u8; 64];
+        let n = self.order_moves(legal, tt_move, &mut buf);
+        let mut best = -INF;
+        let mut best_sq = NO_MOVE;
+        for &sq in &buf[..n] {
+            let pos = 1u64 << sq;
+            let rev = flippable(pos, me, opp);
+            let score = -self.negamax(opp & !rev, me | pos | rev, depth - 1, -beta, -alpha);
+            if self.aborted {
+                return 0;
+            }
+            if score > best {
+                best = score;
+                best_sq = sq;
+            }
+            alpha = alpha.max(score);
+            if alpha >= beta {
+                break;
+            }
+        }
+
+        let bound = if best <= alpha_orig {
+            BOUND_UPPER
+        } else if best >= beta {
+            BOUND_LOWER
+        } else {
+            BOUND_EXACT
         };
+        self.tt.store(hash, TTData { score: best, depth: depth as u8, bound, best: best_sq });
+        best
+    }
 
-        let mut rev = 0;
-        let directions: [i32; 8] = [1, -1, 8, -8, 7, -7, 9, -9];
-        let masks: [u64; 8] = [
-            MASK_NOT_A, MASK_NOT_H, 0xffffffffffffffff, 0xffffffffffffffff,
-            MASK_NOT_H, MASK_NOT_A, MASK_NOT_A, MASK_NOT_H
-        ];
+    /// ルート局面を depth まで探索して (評価値, 最善手のマス) を返す。
+    /// 中断された場合は None。helper スレッドは rotate だけ手の順番をずらして探索を散らす。
+    fn search_root(&mut self, me: u64, opp: u64, depth: u32, rotate: usize) -> Option<(i32, u8)> {
+        let legal = legal_moves(me, opp);
+        let tt_move = self.tt.probe(position_hash(me, opp)).map_or(NO_MOVE, |e| e.best);
+        let mut buf = [0u8; 64];
+        let n = self.order_moves(legal, tt_move, &mut buf);
+        if n == 0 {
+            return None;
+        }
+        buf[..n].rotate_left(rotate % n);
 
-        for i in 0..8 {
-            let mut line_rev = 0;
-            let mut tmp_pos = self.shift_raw(pos, directions[i]) & masks[i];
-            while tmp_pos != 0 && (tmp_pos & opp) != 0 {
-                line_rev |= tmp_pos;
-                tmp_pos = self.shift_raw(tmp_pos, directions[i]) & masks[i];
+        let mut alpha = -INF;
+        let mut best_sq = buf[0];
+        for &sq in &buf[..n] {
+            let pos = 1u64 << sq;
+            let rev = flippable(pos, me, opp);
+            let score = -self.negamax(opp & !rev, me | pos | rev, depth - 1, -INF, -alpha);
+            if self.aborted {
+                return None;
             }
-            if tmp_pos != 0 && (tmp_pos & me) != 0 {
-                rev |= line_rev;
+            if score > alpha {
+                alpha = score;
+                best_sq = sq;
             }
         }
-        rev
+        self.tt.store(
+            position_hash(me, opp),
+            TTData { score: alpha, depth: depth as u8, bound: BOUND_EXACT, best: best_sq },
+        );
+        Some((alpha, best_sq))
     }
+}
 
-    #[inline(always)]
-    fn shift_raw(&self, b: u64, d: i32) -> u64 {
-        if d > 0 { b << d } else { b >> (-d) }
+/// Lazy SMP: メインスレッドが 1..=max_depth の反復深化を行い、helper スレッドは
+/// 深さを 1 ずらして同じ局面を探索する。結果は共有の置換表を通じて互いに利用される。
+/// メインスレッドが max_depth を読み終えたら全スレッドを止める。
+fn lazy_smp(me: u64, opp: u64, max_depth: u32, threads: usize, hash_mb: usize, evaluator: &Evaluator) -> SearchResult {
+    let start = Instant::now();
+    let tt = TranspositionTable::new(hash_mb);
+    let stop = AtomicBool::new(false);
+    let total_nodes = AtomicU64::new(0);
+
+    let mut best: Option<(i32, u8)> = None;
+    let mut completed = 0;
+    let mut depth_times = Vec::new();
+
+    std::thread::scope(|s| {
+        let (tt, stop, total_nodes) = (&tt, &stop, &total_nodes);
+        for id in 1..threads {
+            s.spawn(move || {
+                let mut searcher = Searcher { tt, evaluator, stop, nodes: 0, aborted: false };
+                let mut depth = 1 + (id % 2) as u32;
+                while depth <= max_depth && !stop.load(Ordering::Relaxed) {
+                    searcher.search_root(me, opp, depth, id);
+                    depth += 1;
+                }
+                total_nodes.fetch_add(searcher.nodes, Ordering::Relaxed);
+            });
+        }
+
+        let mut searcher = Searcher { tt, evaluator, stop, nodes: 0, aborted: false };
+        for depth in 1..=max_depth {
+            match searcher.search_root(me, opp, depth, 0) {
+                Some(result) => {
+                    best = Some(result);
+                    completed = depth;
+                    depth_times.push(start.elapsed().as_secs_f64());
+                }
+                None => break,
+            }
+        }
+        stop.store(true, Ordering::Relaxed);
+        total_nodes.fetch_add(searcher.nodes, Ordering::Relaxed);
+    });
+
+    SearchResult {
+        best_move: best.map(|(_, sq)| ((sq % 8) as i32, (sq / 8) as i32)),
+        score: best.map_or(0, |(score, _)| score),
+        depth: completed,
+        nodes: total_nodes.load(Ordering::Relaxed),
+        elapsed: start.elapsed().as_secs_f64(),
+        depth_times,
     }
 }
 
-#[pymodule]
-fn othello_rust(_py: Python, m: &PyModule) -> PyResult<()> {
+// GIL を前提にした状態は持たないので、free-threaded 版の Python でも GIL を有効にしない
+#[pymodule(gil_used = false)]
+fn othello_rust(m: &Bound<'_, PyModule>) -> PyResult<()> {
     m.add_class::<Color>()?;
     m.add_class::<BitboardOthello>()?;
+    m.add_class::<PlayoutPolicy>()?;
+    m.add_class::<BoardSnapshot>()?;
+    m.add_class::<SearchResult>()?;
+    m.add("EVAL_SQUARE_WEIGHTS", DEFAULT_SQUARE_WEIGHTS.to_vec())?;
+    m.add("EVAL_MOBILITY_WEIGHT", DEFAULT_MOBILITY_WEIGHT)?;
+    m.add("CORNER_REGIONS", CORNER_REGIONS.to_vec())?;
     Ok(())
 }
\ No newline at end of file